@@ -0,0 +1,145 @@
+# app/article_store.py
+# =====================================================
+# PERSISTENT ARTICLE STORE
+# + SQLite table keyed by URL, indexed by publish time and base score
+# + Articles are scored once, on arrival; ranking is done lazily on read
+# + Survives restarts → warm start after a Railway redeploy
+# =====================================================
+
+import os
+import time
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+DB_FILE  = os.path.join(DATA_DIR, 'articles.db')
+
+_COLUMNS = (
+    "url", "title", "summary", "source", "category", "region", "priority",
+    "image_url", "pub_date", "published_at", "is_match_end", "keyword_hits",
+    "signature", "base_score",
+)
+
+
+class ArticleStore:
+    """URL-keyed article rows plus an in-memory copy of the last window read.
+
+    published_at is the feed's pub_date, or the time the article was first
+    seen when the feed gives none; the freshness window is applied to it.
+    """
+
+    def __init__(self, path: str = DB_FILE, retention_hours: float = 72):
+        self.path            = path
+        self.retention_hours = retention_hours
+        self._lock   = threading.Lock()
+        self._known: set[str] = set()
+        self._cache: dict[str, dict] = {}
+        self._ready  = False
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+        finally:
+            conn.close()
+
+    def _init(self):
+        if self._ready:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS articles ("
+                " url TEXT PRIMARY KEY, title TEXT NOT NULL, summary TEXT,"
+                " source TEXT, category TEXT, region TEXT, priority INTEGER,"
+                " image_url TEXT, pub_date REAL, published_at REAL NOT NULL,"
+                " is_match_end INTEGER, keyword_hits TEXT, signature TEXT,"
+                " base_score INTEGER NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_published ON articles(published_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_score ON articles(base_score)")
+            cutoff = time.time() - self.retention_hours * 3600
+            conn.execute("DELETE FROM articles WHERE published_at < ?", (cutoff,))
+            self._known = {row[0] for row in conn.execute("SELECT url FROM articles")}
+        self._ready = True
+        print(f"[STORE] Warm start: {len(self._known)} articles on disk", flush=True)
+
+    def known(self, url: str) -> bool:
+        with self._lock:
+            self._init()
+            return url in self._known
+
+    def add(self, articles: list[dict]):
+        """Inserts newly scored articles; URLs already stored are left untouched."""
+        if not articles:
+            return
+        now = time.time()
+        rows = [_to_row(a, now) for a in articles]
+        with self._lock:
+            self._init()
+            with self._connect() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.executemany(
+                    f"INSERT OR IGNORE INTO articles({', '.join(_COLUMNS)}) "
+                    f"VALUES ({', '.join('?' * len(_COLUMNS))})",
+                    rows,
+                )
+                conn.execute("DELETE FROM articles WHERE published_at < ?",
+                             (now - self.retention_hours * 3600,))
+                conn.execute("COMMIT")
+            self._known.update(a["url"] for a in articles)
+
+    def window(self, max_age_hours: float) -> list[dict]:
+        """Articles published within max_age_hours, best base score first.
+
+        Returns copies, so callers may annotate them (relevance_score,
+        cluster_id) without touching the cached rows.
+        """
+        cutoff = time.time() - max_age_hours * 3600
+        with self._lock:
+            self._init()
+            with self._connect() as conn:
+                urls = [row[0] for row in conn.execute(
+                    "SELECT url FROM articles WHERE published_at >= ? ORDER BY base_score DESC",
+                    (cutoff,),
+                )]
+                missing = [u for u in urls if u not in self._cache]
+                for i in range(0, len(missing), 500):
+                    chunk = missing[i:i + 500]
+                    cur = conn.execute(
+                        f"SELECT {', '.join(_COLUMNS)} FROM articles "
+                        f"WHERE url IN ({', '.join('?' * len(chunk))})",
+                        chunk,
+                    )
+                    for row in cur:
+                        self._cache[row[0]] = _from_row(row)
+            self._known.update(urls)
+            self._cache = {u: self._cache[u] for u in urls}
+            return [dict(self._cache[u]) for u in urls]
+
+
+def _to_row(a: dict, now: float) -> tuple:
+    pub = a.get("pub_date")
+    pub_ts = pub.timestamp() if pub else None
+    return (
+        a["url"], a["title"], a.get("summary", ""), a.get("source"), a.get("category"),
+        a.get("region"), a.get("priority", 4), a.get("image_url"),
+        pub_ts, pub_ts if pub_ts is not None else now,
+        int(bool(a.get("is_match_end"))),
+        ",".join(sorted(a.get("keyword_hits") or ())),
+        ",".join(map(str, a["signature"])) if a.get("signature") else None,
+        a.get("base_score", 0),
+    )
+
+
+def _from_row(row: tuple) -> dict:
+    a = dict(zip(_COLUMNS, row))
+    a["pub_date"]     = datetime.fromtimestamp(a["pub_date"], timezone.utc) if a["pub_date"] is not None else None
+    a["is_match_end"] = bool(a["is_match_end"])
+    a["keyword_hits"] = set(a["keyword_hits"].split(",")) if a["keyword_hits"] else set()
+    a["signature"]    = tuple(int(x) for x in a["signature"].split(",")) if a["signature"] else None
+    return a
@@ -0,0 +1,101 @@
+# app/bing_cache.py
+# =====================================================
+# BING IMAGE SEARCH CACHE
+# + Result URLs cached per normalized query (memory + data/ JSON)
+# + Per-URL success / failure counts from the downloader
+# + Known-dead URLs sink to the back of the candidate list
+# =====================================================
+
+import os
+import re
+import json
+import time
+import threading
+from typing import Optional
+
+DATA_DIR   = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data"))
+CACHE_FILE = os.path.join(DATA_DIR, "bing_cache.json")
+
+QUERY_TTL   = 6 * 3600
+URL_TTL     = 7 * 24 * 3600
+MAX_QUERIES = 500
+
+_lock  = threading.Lock()
+_state: Optional[dict] = None
+_dirty = False
+
+
+def normalize_query(query: str) -> str:
+    """Case, punctuation and word order don't change what Bing returns for us."""
+    words = re.findall(r"[a-z0-9]+", query.lower())
+    return " ".join(sorted(set(words)))
+
+
+def _load() -> dict:
+    global _state
+    if _state is None:
+        try:
+            with open(CACHE_FILE, "r") as f:
+                _state = json.load(f)
+        except Exception:
+            _state = {}
+        _state.setdefault("queries", {})
+        _state.setdefault("urls", {})
+    return _state
+
+
+def get(query: str) -> Optional[list[str]]:
+    key = normalize_query(query)
+    with _lock:
+        entry = _load()["queries"].get(key)
+    if not entry or time.time() - entry["ts"] > QUERY_TTL:
+        return None
+    return list(entry["urls"])
+
+
+def put(query: str, urls: list[str]):
+    global _dirty
+    with _lock:
+        queries = _load()["queries"]
+        queries[normalize_query(query)] = {"ts": time.time(), "urls": urls}
+        if len(queries) > MAX_QUERIES:
+            for k in sorted(queries, key=lambda k: queries[k]["ts"])[:len(queries) - MAX_QUERIES]:
+                del queries[k]
+        _dirty = True
+
+
+def record(url: str, ok: bool):
+    """Counts a download outcome for url."""
+    global _dirty
+    with _lock:
+        stats = _load()["urls"].setdefault(url, {"ok": 0, "fail": 0})
+        stats["ok" if ok else "fail"] += 1
+        stats["ts"] = time.time()
+        _dirty = True
+
+
+def rank(urls: list[str]) -> list[str]:
+    """Stable reorder: URLs that have only ever failed go last, most failures last."""
+    with _lock:
+        stats = _load()["urls"]
+        def penalty(u):
+            s = stats.get(u)
+            if not s or s["ok"] >= s["fail"]:
+                return 0
+            return s["fail"] - s["ok"]
+        return sorted(urls, key=penalty)
+
+
+def save():
+    global _dirty
+    with _lock:
+        if not _dirty or _state is None:
+            return
+        cutoff = time.time() - URL_TTL
+        _state["urls"] = {u: s for u, s in _state["urls"].items() if s.get("ts", 0) > cutoff}
+        os.makedirs(DATA_DIR, exist_ok=True)
+        tmp = CACHE_FILE + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(_state, f)
+        os.replace(tmp, CACHE_FILE)
+        _dirty = False
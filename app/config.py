@@ -58,6 +58,24 @@ AGENT_CONFIG = {
         10: {"cricket": 5, "football": 3}, # ISL starts
     },
 
+    # ── REEL RENDERING ────────────────────────────────
+    "render": {
+        "workers":  2,         # parallel slide renders (0 = one per CPU core)
+        "executor": "thread",  # "thread" (Pillow releases the GIL) or "process" (no crop caching)
+        "frame_pipe": True,    # stream RGB frames to FFmpeg; False = data/slide_N.jpg files
+        "segments":   True,    # one cached H.264 segment per slide, stream-copy concat
+        "segment_workers": 0,  # parallel segment encodes (0 = one per CPU core)
+        "segment_fps": 24,     # Instagram rejects reels below 23 fps
+    },
+
+    # ── SCRIPT GENERATION (OpenRouter) ────────────────
+    "llm": {
+        "model":                  "openrouter/auto",
+        "max_tokens":             600,
+        "timeout_seconds":        30,  # hard HTTP timeout per request
+        "latency_budget_seconds": 25,  # past this the template script is used
+    },
+
     # ══════════════════════════════════════════════════
     #  SPORTS CONFIG
     # ══════════════════════════════════════════════════
@@ -68,6 +86,13 @@ AGENT_CONFIG = {
         "realtime_check_interval_minutes": 20,
         "realtime_score_threshold":     70,
 
+        # ── RSS INGESTION ─────────────────────────────
+        "feed_workers":                 6,  # concurrent feed downloads
+        "feed_timeout_seconds":         8,  # per-feed socket timeout
+        "feed_deadline_seconds":        20, # whole batch; late feeds are dropped
+        "corpus_ttl_seconds":           300, # shared article snapshot per cycle
+        "article_retention_hours":      72, # persistent article store (data/articles.db)
+
         "india_keywords": [
             "india", "indian", "bcci", "ipl", "ipl 2026", "team india",
             "virat", "kohli", "rohit", "sharma", "dhoni", "csk", "rcb", "mi",
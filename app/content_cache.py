@@ -0,0 +1,71 @@
+# app/content_cache.py
+# =====================================================
+# GENERATED CONTENT CACHE
+# + Caption + voice script per story (memory + data/ JSON)
+# + Keyed by the story's URL (or normalized title), not the raw theme:
+#   the theme string embeds a relevance score that drifts between ticks
+# + TTL and entry bound; only LLM output is stored, never the template
+# =====================================================
+
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+from typing import Optional
+
+DATA_DIR   = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data"))
+CACHE_FILE = os.path.join(DATA_DIR, "content_cache.json")
+
+TTL_SECONDS = 12 * 3600
+MAX_ENTRIES = 200
+
+_lock  = threading.Lock()
+_state: Optional[dict] = None
+
+
+def theme_key(theme: str) -> str:
+    from app.sports_fetcher import parse_sports_theme
+    story = parse_sports_theme(theme)
+    ident = story.get("url") or story.get("title") or theme
+    ident = re.sub(r"\s+", " ", ident).strip().lower()
+    return hashlib.sha1(ident.encode("utf-8")).hexdigest()
+
+
+def _load() -> dict:
+    global _state
+    if _state is None:
+        try:
+            with open(CACHE_FILE, "r", encoding="utf-8") as f:
+                _state = json.load(f)
+        except Exception:
+            _state = {}
+    return _state
+
+
+def get(theme: str) -> Optional[dict]:
+    key = theme_key(theme)
+    with _lock:
+        entry = _load().get(key)
+    if not entry or time.time() - entry["ts"] > TTL_SECONDS:
+        return None
+    return dict(entry["content"])
+
+
+def put(theme: str, content: dict):
+    key = theme_key(theme)
+    with _lock:
+        state = _load()
+        state[key] = {"ts": time.time(), "content": content}
+        cutoff = time.time() - TTL_SECONDS
+        for k in [k for k, e in state.items() if e["ts"] < cutoff]:
+            del state[k]
+        if len(state) > MAX_ENTRIES:
+            for k in sorted(state, key=lambda k: state[k]["ts"])[:len(state) - MAX_ENTRIES]:
+                del state[k]
+        os.makedirs(DATA_DIR, exist_ok=True)
+        tmp = CACHE_FILE + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp, CACHE_FILE)
@@ -0,0 +1,148 @@
+# app/cooldown_store.py
+# =====================================================
+# COOLDOWN STORE
+# + In-memory key → posted_at map for O(1) checks
+# + SQLite backing (indexed key + posted_at) with atomic writes
+# + Safe if two workers post at once; imports the old JSON file
+# =====================================================
+
+import os
+import json
+import time
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Optional
+
+DATA_DIR    = os.path.join(os.path.dirname(__file__), '..', 'data')
+DB_FILE     = os.path.join(DATA_DIR, 'sports_cooldown.db')
+LEGACY_FILE = os.path.join(DATA_DIR, 'sports_cooldown.json')
+
+RETENTION_HOURS = 48
+
+
+class CooldownStore:
+    """Posted keys (article URLs, later story clusters) with their post time.
+
+    Reads come from memory. refresh() pulls rows other processes wrote since
+    the last sync, using the posted_at index, so it is cheap enough to call
+    once per story selection.
+    """
+
+    def __init__(self, path: str = DB_FILE):
+        self.path    = path
+        self._lock   = threading.Lock()
+        self._posted: dict[str, float] = {}
+        self._sigs:   dict[str, tuple[int, ...]] = {}
+        self._synced = 0.0
+        self._ready  = False
+
+    @contextmanager
+    def _connect(self):
+        # Autocommit mode; writers use explicit BEGIN IMMEDIATE ... COMMIT.
+        # Closing without COMMIT rolls back, so a failed write leaves no trace.
+        conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+        finally:
+            conn.close()
+
+    def _init(self):
+        if self._ready:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cooldown ("
+                " key TEXT PRIMARY KEY,"
+                " posted_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_cooldown_posted ON cooldown(posted_at)")
+            cols = {row[1] for row in conn.execute("PRAGMA table_info(cooldown)")}
+            if "sig" not in cols:
+                conn.execute("ALTER TABLE cooldown ADD COLUMN sig TEXT")
+            self._import_legacy(conn)
+        self._ready = True
+        self._sync()
+
+    def _import_legacy(self, conn: sqlite3.Connection):
+        if not os.path.exists(LEGACY_FILE):
+            return
+        try:
+            with open(LEGACY_FILE, 'r') as f:
+                data = json.load(f)
+            rows = [(k, datetime.fromisoformat(v).replace(tzinfo=timezone.utc).timestamp())
+                    for k, v in data.items()]
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany("INSERT OR IGNORE INTO cooldown(key, posted_at) VALUES (?, ?)", rows)
+            conn.execute("COMMIT")
+            os.replace(LEGACY_FILE, LEGACY_FILE + ".migrated")
+            print(f"[COOLDOWN] Imported {len(rows)} entries from {os.path.basename(LEGACY_FILE)}", flush=True)
+        except Exception as e:
+            print(f"[COOLDOWN] ⚠️  Legacy import failed: {e}", flush=True)
+
+    def _sync(self):
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT key, posted_at, sig FROM cooldown WHERE posted_at > ?", (self._synced,)
+            ).fetchall()
+        for key, posted_at, sig in rows:
+            self._posted[key] = max(posted_at, self._posted.get(key, 0.0))
+            if sig:
+                self._sigs[key] = tuple(int(x) for x in sig.split(","))
+            self._synced = max(self._synced, posted_at)
+
+    def refresh(self):
+        """Picks up posts written by other workers since the last sync."""
+        with self._lock:
+            if not self._ready:
+                self._init()
+            else:
+                self._sync()
+
+    def posted_at(self, key: str) -> Optional[float]:
+        with self._lock:
+            if not self._ready:
+                self._init()
+            return self._posted.get(key)
+
+    def is_on_cooldown(self, key: str, hours: float) -> bool:
+        posted_at = self.posted_at(key)
+        return posted_at is not None and time.time() - posted_at < hours * 3600
+
+    def signatures(self, hours: float) -> list[tuple[str, tuple[int, ...]]]:
+        """(key, signature) of story clusters posted within the last `hours`."""
+        cutoff = time.time() - hours * 3600
+        with self._lock:
+            if not self._ready:
+                self._init()
+            return [(k, sig) for k, sig in self._sigs.items() if self._posted.get(k, 0.0) >= cutoff]
+
+    def mark(self, *keys: str, signatures: Optional[dict[str, tuple[int, ...]]] = None):
+        """Records keys as posted now and prunes entries past retention, atomically.
+
+        signatures maps cluster keys to their MinHash so later near-duplicates
+        can be matched against them.
+        """
+        signatures = signatures or {}
+        now    = time.time()
+        cutoff = now - RETENTION_HOURS * 3600
+        rows   = [(k, now, None) for k in keys]
+        rows  += [(k, now, ",".join(map(str, sig))) for k, sig in signatures.items()]
+        with self._lock:
+            if not self._ready:
+                self._init()
+            with self._connect() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.executemany(
+                    "INSERT OR REPLACE INTO cooldown(key, posted_at, sig) VALUES (?, ?, ?)", rows,
+                )
+                conn.execute("DELETE FROM cooldown WHERE posted_at < ?", (cutoff,))
+                conn.execute("COMMIT")
+            for k, _, _ in rows:
+                self._posted[k] = now
+            self._sigs.update(signatures)
+            self._posted = {k: t for k, t in self._posted.items() if t >= cutoff}
+            self._sigs   = {k: s for k, s in self._sigs.items() if k in self._posted}
@@ -1,40 +1,100 @@
 # app/engine.py  v7.1 — 60s reel, smart voice script
-import os, gc, asyncio, subprocess, re
-import edge_tts
+import os, gc, asyncio, subprocess, re, tempfile, time
+from app.config import AGENT_CONFIG
+from app import content_cache, tts_cache, media_probe, lexicon
+
+RENDER_CONFIG = AGENT_CONFIG.get("render", {})
+LLM_CONFIG    = AGENT_CONFIG.get("llm", {})
+OUTPUT_FPS    = 25   # what -loop 1 image inputs produced before
+VOICE         = "ml-IN-MidhunNeural"
+VOICE_RATE    = "+10%"
 
 DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data"))
 os.makedirs(DATA_DIR, exist_ok=True)
 
 
-def _probe_duration(path):
-    cmd = ["ffprobe", "-v", "error", "-show_entries", "format=duration",
-           "-of", "default=noprint_wrappers=1:nokey=1", path]
-    try:
-        r = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-        return float(r.stdout.strip())
-    except Exception:
-        return 0.0
-
-
 async def generate_voice(script):
+    """Sentence-split, cached, parallel TTS (app/tts_cache.py) → temp_audio.mp3.
+
+    English terms are respelled via app/replacements.csv first, so edge-tts
+    says "IPL" the Malayalam way.
+    """
+    script = lexicon.apply(script)
     audio_path = os.path.join(DATA_DIR, "temp_audio.mp3")
     if os.path.exists(audio_path):
         os.remove(audio_path)
-    communicate = edge_tts.Communicate(script, "ml-IN-MidhunNeural", rate="+10%")
-    await communicate.save(audio_path)
-    await asyncio.sleep(1)
+    audio = await tts_cache.synthesize(script, VOICE, VOICE_RATE)
+    with open(audio_path, "wb") as f:
+        f.write(audio)
     if not os.path.exists(audio_path) or os.path.getsize(audio_path) < 1000:
         raise RuntimeError("Audio generation failed")
-    duration = _probe_duration(audio_path)
+    duration = media_probe.mp3_duration(audio, trust_vbr_header=False) or 0.0   # joined clips
     if duration < 1.0:
         raise RuntimeError(f"Audio duration invalid: {duration}s")
     print(f"[ENGINE] Audio ready: {duration:.1f}s ({os.path.getsize(audio_path)//1024} KB)")
     return audio_path
 
 
+_AUDIO_ARGS = [
+    "-c:a", "aac",
+    "-ar", "44100",
+    "-ac", "2",
+    "-b:a", "128k",
+]
+
+_ENCODE_ARGS = [
+    "-c:v", "libx264",
+    "-preset", "ultrafast",
+    "-pix_fmt", "yuv420p",
+] + _AUDIO_ARGS + [
+    "-movflags", "+faststart",
+    "-shortest",
+]
+
+
+def _render_from_frames(frames, audio_path, output_path, per_image):
+    """Streams raw RGB frames to FFmpeg's stdin — no slide JPEGs on disk.
+
+    Each slide is sent once at an input rate of one frame per slide
+    duration; FFmpeg repeats it up to OUTPUT_FPS. The last frame is sent
+    twice so video outlasts audio and -shortest trims at the audio end.
+    """
+    w, h = frames[0].size
+    cmd = (
+        ["ffmpeg", "-y", "-loglevel", "error", "-i", audio_path,
+         "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{w}x{h}",
+         "-framerate", f"{1 / per_image:.6f}", "-i", "pipe:0",
+         "-map", "1:v", "-map", "0:a:0", "-r", str(OUTPUT_FPS)]
+        + _ENCODE_ARGS + [output_path]
+    )
+    print("[ENGINE] FFmpeg render+mux (frame pipe)...")
+    # stderr goes to a file: a full stderr pipe would stall FFmpeg mid-write
+    with tempfile.TemporaryFile() as err:
+        proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=err)
+        try:
+            for frame in frames + frames[-1:]:
+                proc.stdin.write(frame.convert("RGB").tobytes())
+        except BrokenPipeError:
+            pass
+        finally:
+            proc.stdin.close()
+        proc.wait()
+        err.seek(0)
+        stderr = err.read().decode("utf-8", "replace")
+    if proc.returncode != 0:
+        raise RuntimeError(f"FFmpeg failed:\n{stderr[-1000:]}")
+    return stderr
+
+
 def render_reel(image_paths, audio_path, output_path):
-    """Single-pass FFmpeg concat+mux. No MoviePy."""
-    audio_dur = _probe_duration(audio_path)
+    """FFmpeg render+mux. No MoviePy.
+
+    image_paths may also be PIL images (frame mode), which are piped to
+    FFmpeg as raw video instead of being read back from JPEG files. With
+    render.segments on, each slide is encoded as a cached segment and the
+    reel is stream-copied together (see app/reel_segments.py).
+    """
+    audio_dur = media_probe.duration(audio_path)
     if audio_dur < 1.0:
         raise RuntimeError(f"Audio duration invalid: {audio_dur}s")
 
@@ -42,6 +102,30 @@ def render_reel(image_paths, audio_path, output_path):
     per_image = audio_dur / n
     print(f"[ENGINE] {n} slides x {per_image:.2f}s = {audio_dur:.1f}s")
 
+    if RENDER_CONFIG.get("segments", True):
+        from app.reel_segments import encode_segments, concat_with_audio
+        segments = encode_segments(
+            list(image_paths), per_image,
+            fps=RENDER_CONFIG.get("segment_fps", 24),
+            workers=RENDER_CONFIG.get("segment_workers", 0),
+        )
+        print("[ENGINE] FFmpeg concat+mux (segments)...")
+        stderr = concat_with_audio(segments, audio_path, output_path, _AUDIO_ARGS)
+    elif not isinstance(image_paths[0], str):
+        stderr = _render_from_frames(list(image_paths), audio_path, output_path, per_image)
+    else:
+        stderr = _render_concat_filter(image_paths, audio_path, output_path, per_image)
+
+    final_dur = media_probe.duration(output_path)
+    print(f"[ENGINE] Reel ready: {final_dur:.1f}s -> {output_path}")
+    if final_dur < 1.0:
+        raise RuntimeError(f"Output {final_dur}s invalid.\n{stderr[-500:]}")
+    gc.collect()
+
+
+def _render_concat_filter(image_paths, audio_path, output_path, per_image):
+    """Single libx264 pass over a concat filter of looping stills."""
+    n = len(image_paths)
     inputs = ["-i", audio_path]
     for img in image_paths:
         inputs += ["-loop", "1", "-t", str(per_image), "-i", img]
@@ -56,91 +140,167 @@ def render_reel(image_paths, audio_path, output_path):
             "-filter_complex", concat_filter,
             "-map", "[v]",
             "-map", "0:a:0",
-            "-c:v", "libx264",
-            "-preset", "ultrafast",
-            "-pix_fmt", "yuv420p",
-            "-c:a", "aac",
-            "-ar", "44100",
-            "-ac", "2",
-            "-b:a", "128k",
-            "-movflags", "+faststart",
-            "-shortest",
-            output_path,
-        ]
+        ] + _ENCODE_ARGS + [output_path]
     )
 
     print("[ENGINE] FFmpeg render+mux...")
     result = subprocess.run(cmd, capture_output=True, text=True)
     if result.returncode != 0:
         raise RuntimeError(f"FFmpeg failed:\n{result.stderr[-1000:]}")
+    return result.stderr
 
-    final_dur = _probe_duration(output_path)
-    print(f"[ENGINE] Reel ready: {final_dur:.1f}s -> {output_path}")
-    if final_dur < 1.0:
-        raise RuntimeError(f"Output {final_dur}s invalid.\n{result.stderr[-500:]}")
-    gc.collect()
+
+def _llm_client():
+    """AsyncOpenAI client for one generate_content call.
+
+    Post cycles each run on a fresh event loop (run_post_cycle_sync) and
+    httpx connections can't outlive the loop that opened them, so a client
+    can't usefully be kept between cycles; generate_content closes it
+    (releasing its connection pool) before returning.
+    """
+    from openai import AsyncOpenAI
+    return AsyncOpenAI(
+        api_key=os.getenv("OPENROUTER_API_KEY"),
+        base_url="https://openrouter.ai/api/v1",
+        timeout=LLM_CONFIG.get("timeout_seconds", 30),
+        max_retries=1,
+    )
+
+
+async def _llm_content(client, theme):
+    prompt = (
+        f"Create Malayalam sports reel content for Instagram.\n"
+        f"Topic: {theme}\n\n"
+        f"Output exactly 2 lines:\n"
+        f"LINE 1: Instagram caption in English with emojis and hashtags (max 150 chars).\n"
+        f"LINE 2: Malayalam voiceover script — write AT LEAST 8 full sentences in Malayalam "
+        f"covering: what happened, who is involved, why it matters, fan reaction, what happens next. "
+        f"ONLY Malayalam script on this line, no English."
+    )
+    response = await client.chat.completions.create(
+        model=LLM_CONFIG.get("model", "openrouter/auto"),
+        messages=[{"role": "user", "content": prompt}],
+        max_tokens=LLM_CONFIG.get("max_tokens", 600),
+    )
+    text = response.choices[0].message.content.strip()
+    lines = text.split("\n", 1)
+    caption = re.sub(r"[*_`]+", "", lines[0]).strip()
+    script  = re.sub(r"[*_`]+", "", lines[1] if len(lines) > 1 else caption).strip()
+    return {"caption": caption, "voice_script": script}
+
+
+def _template_content(theme):
+    """Instant fallback script, personalised with the story title."""
+    subject = theme.replace("SPORTS_NEWS:", "").strip()[:60]
+    return {
+        "caption": f"🚨 {subject} | Latest Sports Update 🏏🔥 #IPL2026 #CricketNews #Sports",
+        "voice_script": (
+            f"സ്പോർട്സ് പ്രേമികളേ, ഇതാ ഇന്നത്തെ ഏറ്റവും വലിയ വാർത്ത. "
+            f"{subject} എന്ന വിഷയത്തിൽ ക്രിക്കറ്റ് ലോകം ആകെ ചർച്ച ചെയ്യുകയാണ്. "
+            f"ഈ വാർത്ത കേട്ടപ്പോൾ ആരാധകർ സോഷ്യൽ മീഡിയയിൽ കോളിളക്കം സൃഷ്ടിച്ചു. "
+            f"ടീം മാനേജ്മെന്റ് ഇതിനെക്കുറിച്ച് ഇതുവരെ ഔദ്യോഗിക പ്രതികരണം നടത്തിയിട്ടില്ല. "
+            f"ഇനി വരുന്ന ദിവസങ്ങളിൽ കൂടുതൽ വിവരങ്ങൾ പുറത്തുവരും എന്നാണ് പ്രതീക്ഷിക്കുന്നത്. "
+            f"ഇന്ത്യൻ ക്രിക്കറ്റ് ബോർഡ് ഈ സ്ഥിതിഗതികൾ സസൂക്ഷ്മം നിരീക്ഷിക്കുകയാണ്. "
+            f"ആരാധകർ തങ്ങളുടെ പ്രിയ താരത്തിന് വേണ്ടി ഒരുമിച്ച് നിൽക്കുകയാണ്. "
+            f"ഏറ്റവും പുതിയ സ്പോർട്സ് അപ്ഡേറ്റുകൾ അറിയാൻ ഈ പേജ് ഫോളോ ചെയ്യൂ. "
+            f"ലൈക്ക് ചെയ്യൂ, ഷെയർ ചെയ്യൂ, കമന്റ് ചെയ്യൂ!"
+        ),
+    }
 
 
 async def generate_content(theme):
-    from openai import OpenAI
+    """LLM caption + script within llm.latency_budget_seconds, else the template.
+
+    A late LLM call is cancelled, not awaited — its answer is discarded.
+    LLM answers are cached per story, so a retried cycle reuses the script.
+    """
+    cached = content_cache.get(theme)
+    if cached:
+        print("[ENGINE] Content cache hit", flush=True)
+        return cached
+    budget = LLM_CONFIG.get("latency_budget_seconds", 25)
+    client = None
     try:
-        client = OpenAI(
-            api_key=os.getenv("OPENROUTER_API_KEY"),
-            base_url="https://openrouter.ai/api/v1",
-        )
-        prompt = (
-            f"Create Malayalam sports reel content for Instagram.\n"
-            f"Topic: {theme}\n\n"
-            f"Output exactly 2 lines:\n"
-            f"LINE 1: Instagram caption in English with emojis and hashtags (max 150 chars).\n"
-            f"LINE 2: Malayalam voiceover script — write AT LEAST 8 full sentences in Malayalam "
-            f"covering: what happened, who is involved, why it matters, fan reaction, what happens next. "
-            f"ONLY Malayalam script on this line, no English."
-        )
-        response = client.chat.completions.create(
-            model="openrouter/auto",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=600,
-        )
-        text = response.choices[0].message.content.strip()
-        lines = text.split("\n", 1)
-        caption = re.sub(r"[*_`]+", "", lines[0]).strip()
-        script  = re.sub(r"[*_`]+", "", lines[1] if len(lines) > 1 else caption).strip()
-        return {"caption": caption, "voice_script": script}
+        client  = _llm_client()
+        content = await asyncio.wait_for(_llm_content(client, theme), timeout=budget)
+        content_cache.put(theme, content)
+        return content
+    except asyncio.TimeoutError:
+        print(f"[ENGINE] LLM over {budget}s budget, using fallback", flush=True)
     except Exception as e:
         print(f"[ENGINE] LLM failed, using fallback: {e}")
-        # Extract subject from theme for slightly personalised fallback
-        subject = theme.replace("SPORTS_NEWS:", "").strip()[:60]
-        return {
-            "caption": f"🚨 {subject} | Latest Sports Update 🏏🔥 #IPL2026 #CricketNews #Sports",
-            "voice_script": (
-                f"സ്പോർട്സ് പ്രേമികളേ, ഇതാ ഇന്നത്തെ ഏറ്റവും വലിയ വാർത്ത. "
-                f"{subject} എന്ന വിഷയത്തിൽ ക്രിക്കറ്റ് ലോകം ആകെ ചർച്ച ചെയ്യുകയാണ്. "
-                f"ഈ വാർത്ത കേട്ടപ്പോൾ ആരാധകർ സോഷ്യൽ മീഡിയയിൽ കോളിളക്കം സൃഷ്ടിച്ചു. "
-                f"ടീം മാനേജ്മെന്റ് ഇതിനെക്കുറിച്ച് ഇതുവരെ ഔദ്യോഗിക പ്രതികരണം നടത്തിയിട്ടില്ല. "
-                f"ഇനി വരുന്ന ദിവസങ്ങളിൽ കൂടുതൽ വിവരങ്ങൾ പുറത്തുവരും എന്നാണ് പ്രതീക്ഷിക്കുന്നത്. "
-                f"ഇന്ത്യൻ ക്രിക്കറ്റ് ബോർഡ് ഈ സ്ഥിതിഗതികൾ സസൂക്ഷ്മം നിരീക്ഷിക്കുകയാണ്. "
-                f"ആരാധകർ തങ്ങളുടെ പ്രിയ താരത്തിന് വേണ്ടി ഒരുമിച്ച് നിൽക്കുകയാണ്. "
-                f"ഏറ്റവും പുതിയ സ്പോർട്സ് അപ്ഡേറ്റുകൾ അറിയാൻ ഈ പേജ് ഫോളോ ചെയ്യൂ. "
-                f"ലൈക്ക് ചെയ്യൂ, ഷെയർ ചെയ്യൂ, കമന്റ് ചെയ്യൂ!"
-            ),
-        }
-
-
-async def run_engine(theme):
-    from app.image_assembler import assemble_sports_slides
-    from app.sports_fetcher import fetch_all_sports_news, parse_sports_theme
+    finally:
+        if client is not None:
+            await client.close()
+    return _template_content(theme)
 
-    sport_data = parse_sports_theme(theme)
-    content    = await generate_content(theme)
-    audio_path = await generate_voice(content["voice_script"])
 
-    all_articles = fetch_all_sports_news(max_age_hours=24)
-    image_paths  = await assemble_sports_slides(sport_data, all_articles)
+async def _run_stages(stages):
+    """Tiny dependency-graph executor.
 
-    if not image_paths:
-        raise ValueError("No images found")
+    stages maps name -> (dependency names, async fn). Each fn is called
+    with its dependencies' results, in order, as soon as they are all
+    done, so independent branches overlap. Returns (results, timings);
+    the first failure cancels every stage still running.
+    """
+    tasks, timings = {}, {}
 
+    async def run(name):
+        deps, fn = stages[name]
+        args = [await tasks[d] for d in deps]
+        t0 = time.perf_counter()
+        result = await fn(*args)
+        timings[name] = round(time.perf_counter() - t0, 2)
+        return result
+
+    for name in stages:
+        tasks[name] = asyncio.create_task(run(name), name=f"stage:{name}")
+    try:
+        await asyncio.gather(*tasks.values())
+    except BaseException:
+        for t in tasks.values():
+            t.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+        raise
+    return {name: t.result() for name, t in tasks.items()}, timings
+
+
+async def run_engine(theme, corpus=None):
+    """content → voice  ┐
+       corpus → slides  ┴→ render
+
+    Slides don't depend on the script, so image search/download/render
+    runs alongside the LLM and TTS; only render_reel waits for both.
+    """
+    from app.image_assembler import assemble_sports_slides
+    from app.sports_fetcher import get_corpus, parse_sports_theme
+
+    sport_data  = parse_sports_theme(theme)
     output_path = os.path.join(DATA_DIR, "reel.mp4")
-    render_reel(image_paths, audio_path, output_path)
-    return {"video_path": output_path, "caption": content["caption"]}
\ No newline at end of file
+
+    async def slides():
+        articles = (corpus or await asyncio.to_thread(get_corpus, 24)).articles
+        image_paths = await assemble_sports_slides(
+            sport_data, articles, as_frames=RENDER_CONFIG.get("frame_pipe", True),
+        )
+        if not image_paths:
+            raise ValueError("No images found")
+        return image_paths
+
+    async def voice(content):
+        return await generate_voice(content["voice_script"])
+
+    async def render(image_paths, audio_path):
+        await asyncio.to_thread(render_reel, image_paths, audio_path, output_path)
+        return output_path
+
+    t0 = time.perf_counter()
+    results, timings = await _run_stages({
+        "content": ((),                  lambda: generate_content(theme)),
+        "voice":   (("content",),        voice),
+        "slides":  ((),                  slides),
+        "render":  (("slides", "voice"), render),
+    })
+    timings["total"] = round(time.perf_counter() - t0, 2)
+    print("[ENGINE] Stages: " + " | ".join(f"{k} {v:.1f}s" for k, v in timings.items()), flush=True)
+    return {"video_path": output_path, "caption": results["content"]["caption"], "timings": timings}
@@ -0,0 +1,97 @@
+# app/feed_cache.py
+# =====================================================
+# CONDITIONAL-GET FEED CACHE
+# + Remembers ETag / Last-Modified per feed URL
+# + Body hash short-circuit for servers that ignore validators
+# + Stores the parsed entries so a 304 skips feedparser entirely
+# =====================================================
+
+import os
+import json
+import hashlib
+import threading
+from typing import Optional
+
+DATA_DIR   = os.path.join(os.path.dirname(__file__), '..', 'data')
+CACHE_FILE = os.path.join(DATA_DIR, 'feed_cache.json')
+
+_lock  = threading.Lock()
+_cache: Optional[dict] = None
+_dirty = False
+
+
+def _load() -> dict:
+    global _cache
+    if _cache is None:
+        try:
+            with open(CACHE_FILE, 'r') as f:
+                _cache = json.load(f)
+        except Exception:
+            _cache = {}
+    return _cache
+
+
+def body_hash(body: bytes) -> str:
+    return hashlib.sha1(body).hexdigest()
+
+
+def conditional_headers(url: str) -> dict:
+    """If-None-Match / If-Modified-Since headers for a previously seen feed."""
+    with _lock:
+        entry = _load().get(url) or {}
+    headers = {}
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+def get_entries(url: str, digest: Optional[str] = None) -> Optional[list[dict]]:
+    """Cached entries for url; when digest is given, only if the body hash matches."""
+    with _lock:
+        entry = _load().get(url)
+    if not entry:
+        return None
+    if digest is not None and entry.get("hash") != digest:
+        return None
+    return entry.get("entries")
+
+
+def store(url: str, entries: list[dict], digest: str, etag: Optional[str], last_modified: Optional[str]):
+    global _dirty
+    with _lock:
+        _load()[url] = {
+            "etag":          etag,
+            "last_modified": last_modified,
+            "hash":          digest,
+            "entries":       entries,
+        }
+        _dirty = True
+
+
+def touch(url: str, etag: Optional[str], last_modified: Optional[str]):
+    """Refreshes the validators of a feed whose body did not change."""
+    global _dirty
+    with _lock:
+        entry = _load().get(url)
+        if not entry:
+            return
+        if etag and etag != entry.get("etag"):
+            entry["etag"], _dirty = etag, True
+        if last_modified and last_modified != entry.get("last_modified"):
+            entry["last_modified"], _dirty = last_modified, True
+
+
+def save():
+    """Writes the cache to disk if anything changed since the last save."""
+    global _dirty
+    with _lock:
+        if not _dirty or _cache is None:
+            return
+        os.makedirs(DATA_DIR, exist_ok=True)
+        tmp = CACHE_FILE + ".tmp"
+        with open(tmp, 'w') as f:
+            json.dump(_cache, f)
+        os.replace(tmp, CACHE_FILE)
+        _dirty = False
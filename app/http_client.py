@@ -0,0 +1,95 @@
+# app/http_client.py
+# =====================================================
+# SHARED HTTP CLIENT
+# + One pooled requests.Session per retry policy (keep-alive per host)
+# + Default connect/read timeouts on every call
+# + Retry with backoff for idempotent requests only (Retry-After capped)
+# + Async face runs the same pooled calls off the event loop
+# =====================================================
+
+import asyncio
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_TIMEOUT = (5, 15)    # (connect, read) seconds
+POOL_HOSTS      = 16         # distinct hosts kept alive
+POOL_PER_HOST   = 16         # concurrent connections per host
+RETRY_AFTER_CAP = 5          # seconds; longer Retry-After values are clipped
+
+
+class _CappedRetry(Retry):
+    """Honours Retry-After, but never sleeps longer than RETRY_AFTER_CAP.
+
+    A throttled Bing or Graph response can ask for minutes; waiting that
+    long would stall the slides stage or a whole post cycle.
+    """
+
+    def get_retry_after(self, response):
+        after = super().get_retry_after(response)
+        return None if after is None else min(after, RETRY_AFTER_CAP)
+
+
+_RETRY = _CappedRetry(
+    total=2,
+    backoff_factor=0.5,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset({"GET", "HEAD"}),
+    respect_retry_after_header=True,
+    raise_on_status=False,
+)
+
+_lock     = threading.Lock()
+_sessions: dict[bool, requests.Session] = {}
+
+
+def session(retry: bool = True) -> requests.Session:
+    """The process-wide pooled session (with or without the retry policy)."""
+    s = _sessions.get(retry)
+    if s is not None:
+        return s
+    with _lock:
+        s = _sessions.get(retry)
+        if s is None:
+            s = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=POOL_HOSTS,
+                pool_maxsize=POOL_PER_HOST,
+                max_retries=_RETRY if retry else 0,
+            )
+            s.mount("https://", adapter)
+            s.mount("http://", adapter)
+            _sessions[retry] = s
+    return s
+
+
+def request(method: str, url: str, retry: bool = True, **kwargs) -> requests.Response:
+    kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+    return session(retry).request(method, url, **kwargs)
+
+
+def get(url: str, retry: bool = True, **kwargs) -> requests.Response:
+    """Pooled GET. Pass retry=False where the caller has its own deadline."""
+    return request("GET", url, retry=retry, **kwargs)
+
+
+def post(url: str, retry: bool = False, **kwargs) -> requests.Response:
+    """Pooled POST. Not retried by default — most POSTs here are not idempotent."""
+    return request("POST", url, retry=retry, **kwargs)
+
+
+async def aget(url: str, retry: bool = True, **kwargs) -> requests.Response:
+    return await asyncio.to_thread(get, url, retry, **kwargs)
+
+
+async def apost(url: str, retry: bool = False, **kwargs) -> requests.Response:
+    return await asyncio.to_thread(post, url, retry, **kwargs)
+
+
+def close():
+    with _lock:
+        for s in _sessions.values():
+            s.close()
+        _sessions.clear()
@@ -2,11 +2,17 @@
 # Images are fetched by searching the article subject directly on Bing Images.
 # No API key needed. Returns exactly 10 slides → 60s reel at 6s/slide.
 
-import os, gc, re, requests
+import os, gc, re, asyncio, threading
+from functools import lru_cache
+import numpy as np
 from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 from urllib.parse import quote_plus
 from PIL import Image, ImageDraw, ImageFont, ImageEnhance, ImageOps
-from app.sports_fetcher import get_og_image, SCRAPE_HEADERS
+from app.config import AGENT_CONFIG
+from app.sports_fetcher import get_og_image, save_og_cache, SCRAPE_HEADERS
+from app import http_client, bing_cache
+from app.image_cache import IMAGE_CACHE, CROP_SIZE
 
 DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data"))
 os.makedirs(DATA_DIR, exist_ok=True)
@@ -15,25 +21,57 @@ WHITE = (255, 255, 255)
 RED   = (210, 25,  25)
 BLACK = (0,   0,   0)
 TARGET_SLIDES = 10   # 10 slides × 6s = 60s
+DOWNLOAD_WORKERS = 6 # concurrent image downloads
 
 # ── fonts ─────────────────────────────────────────────────────
-def _font(size, bold=False):
-    paths = (
-        ["C:/Windows/Fonts/arialbd.ttf",
-         "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"]
-        if bold else
-        ["C:/Windows/Fonts/arial.ttf",
-         "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"]
-    )
-    for p in paths:
+_FONT_PATHS = {
+    True:  ["C:/Windows/Fonts/arialbd.ttf",
+            "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"],
+    False: ["C:/Windows/Fonts/arial.ttf",
+            "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"],
+}
+_fonts    = {}   # (size, bold) -> loaded face; each face/size is opened once
+_advances = {}   # font -> {char: advance width}
+
+def _load_font(size, bold):
+    for p in _FONT_PATHS[bold]:
         if os.path.exists(p):
             try: return ImageFont.truetype(p, size)
             except: pass
     return ImageFont.load_default()
 
+def _font(size, bold=False):
+    f = _fonts.get((size, bold))
+    if f is None:
+        f = _fonts[(size, bold)] = _load_font(size, bold)
+    return f
+
+def _text_width(font, text):
+    """Sum of cached per-glyph advances (kerning ignored — close enough to wrap on)."""
+    adv = _advances.get(font)
+    if adv is None:
+        adv = _advances[font] = {}
+    w = 0.0
+    for ch in text:
+        a = adv.get(ch)
+        if a is None:
+            a = adv[ch] = font.getlength(ch)
+        w += a
+    return w
+
 # ── image processing ──────────────────────────────────────────
+# Off in process-pool render workers: their IMAGE_CACHE is a copy, so crop
+# sizes recorded there would never reach the parent's index and quota
+_CACHE_CROPS = True
+
+def _disable_crop_cache():
+    global _CACHE_CROPS
+    _CACHE_CROPS = False
+
 def _smart_crop(img, w=1080, h=1920):
     img = img.convert("RGB")
+    if img.size == (w, h):   # cached 1080x1920 derivative
+        return img
     r = w / h
     ir = img.width / img.height
     if ir > r:
@@ -42,28 +80,61 @@ def _smart_crop(img, w=1080, h=1920):
         nw, nh = w, int(w / ir)
     img = img.resize((nw, nh), Image.Resampling.LANCZOS)
     l, t = (nw - w) // 2, (nh - h) // 2
-    return img.crop((l, t, l + w, t + h))
+    out = img.crop((l, t, l + w, t + h))
+    src = img.info.get("source_url")
+    if src and (w, h) == CROP_SIZE and _CACHE_CROPS:
+        try: IMAGE_CACHE.put_crop(src, out)
+        except Exception as e: print(f"[ASSEMBLER] Crop cache failed: {e}")
+    return out
+
+# ── slide templates ───────────────────────────────────────────
+# Static chrome is rendered once and pasted. The dark bands are applied in
+# place on just their rows through a lookup table — same result as
+# compositing a black RGBA overlay, without a full-frame RGBA round trip.
+_BANDS     = (((0, 0, 1080, 501), 130),       # headline band
+              ((0, 1450, 1080, 1820), 150))   # bottom band (ticker covers 1820+)
+TICKER_POS = (0, 1820)
+TICKER_TXT = "🔴 LIVE  •  Follow for more sports updates  •  🔴"
+
+@lru_cache(maxsize=None)
+def _dim_lut(alpha):
+    keep = 255 - alpha
+    return [(v * keep + 127) // 255 for v in range(256)] * 3
+
+@lru_cache(maxsize=None)
+def _ticker_layer(w=1080, h=100):
+    bar = Image.new("RGB", (w, h), RED)
+    ImageDraw.Draw(bar).text((20, 13), TICKER_TXT, font=_font(30), fill=WHITE)
+    return bar
+
+@lru_cache(maxsize=256)
+def _badge(w, h, fill=RED):
+    """A filled label box, rendered once per size. The label is drawn on the
+    card afterwards, so text wider than the box runs past it as it always has."""
+    return Image.new("RGB", (w, h), fill)
 
 def _enhance(img):
     img = _smart_crop(img)
     img = ImageOps.autocontrast(img, cutoff=1)
     img = ImageEnhance.Sharpness(img).enhance(1.6)
-    ov = Image.new("RGBA", img.size, (0,0,0,0))
-    d = ImageDraw.Draw(ov)
-    d.rectangle([0, 0, 1080, 500],      fill=(0,0,0,130))
-    d.rectangle([0, 1450, 1080, 1920],  fill=(0,0,0,150))
-    return Image.alpha_composite(img.convert("RGBA"), ov).convert("RGB")
+    for box, alpha in _BANDS:
+        img.paste(img.crop(box).point(_dim_lut(alpha)), box[:2])
+    return img
 
 def _wrap(draw, text, font, max_w):
-    words, lines, line = text.split(), [], ""
-    for w in words:
-        t = (line + " " + w).strip()
-        if draw.textbbox((0,0), t, font=font)[2] <= max_w:
-            line = t
+    # Linear: each word is measured once and added to a running line width
+    space = _text_width(font, " ")
+    lines, line, line_w = [], [], 0.0
+    for w in text.split():
+        ww = _text_width(font, w)
+        t_w = line_w + space + ww if line else ww
+        if t_w <= max_w or not line:
+            line.append(w)
+            line_w = t_w
         else:
-            if line: lines.append(line)
-            line = w
-    if line: lines.append(line)
+            lines.append(" ".join(line))
+            line, line_w = [w], ww
+    if line: lines.append(" ".join(line))
     return lines
 
 # ── keyword extraction ────────────────────────────────────────
@@ -107,12 +178,16 @@ _BING_HDR = {
 }
 
 def _bing_search(query, count=20):
+    cached = bing_cache.get(query)
+    if cached:
+        print(f"[ASSEMBLER] Bing cache → {len(cached)} URLs")
+        return bing_cache.rank(cached)[:count]
     url = (
         "https://www.bing.com/images/search"
         f"?q={quote_plus(query)}&form=HDRSC2&first=1"
     )
     try:
-        r = requests.get(url, headers=_BING_HDR, timeout=10)
+        r = http_client.get(url, headers=_BING_HDR, timeout=10)
         if r.status_code != 200:
             print(f"[ASSEMBLER] Bing HTTP {r.status_code}")
             return []
@@ -128,65 +203,263 @@ def _bing_search(query, count=20):
             if len(out) >= count:
                 break
         print(f"[ASSEMBLER] Bing → {len(out)} URLs")
-        return out
+        if out:
+            bing_cache.put(query, out)
+        return bing_cache.rank(out)
     except Exception as e:
         print(f"[ASSEMBLER] Bing failed: {e}")
         return []
 
-def _download(url, min_w=400, min_h=300):
+MAX_IMAGE_BYTES  = 15 * 1024 * 1024
+MAX_IMAGE_PIXELS = 40_000_000           # reject anything above ~40 MP outright
+SNIFF_STEPS      = (16 * 1024, 64 * 1024, 256 * 1024)  # JPEG EXIF can push SOF past 16 KB
+READ_CHUNK       = 64 * 1024                            # body reads once the header is known
+_REJECT_TYPES    = ("image/svg", "image/gif")
+_REJECT_FORMATS  = {"GIF"}
+
+def _sniff(head):
+    """(format, (w, h)) from the first bytes of an image, or None if not enough yet."""
     try:
-        r = requests.get(url, headers=_BING_HDR, timeout=8, stream=True)
-        if r.status_code != 200:
-            return None
-        data = b""
-        for chunk in r.iter_content(8192):
-            data += chunk
-            if len(data) > 15 * 1024 * 1024:
+        with Image.open(BytesIO(head)) as probe:
+            return probe.format, probe.size
+    except Exception:
+        return None
+
+def _open_checked(fp, min_w, min_h):
+    img = Image.open(fp)
+    if img.format in _REJECT_FORMATS or img.width < min_w or img.height < min_h:
+        return None
+    if img.width * img.height > MAX_IMAGE_PIXELS:
+        return None
+    # JPEG: decode at the smallest DCT scale that still covers a 1080x1920 crop
+    if img.format == "JPEG":
+        img.draft("RGB", (1080, 1920))
+    return img
+
+# ── perceptual dedup ──────────────────────────────────────────
+DUP_MAX_BITS = 6   # dHash Hamming distance at or below this = same photo
+
+def _dhash(img):
+    """64-bit difference hash from a 9x8 grayscale thumbnail."""
+    thumb = img.convert("L").resize((9, 8), Image.Resampling.BILINEAR, reducing_gap=2.0)
+    px = np.asarray(thumb, dtype=np.int16)
+    bits = (px[:, 1:] > px[:, :-1]).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+class _DistinctImages:
+    """Remembers accepted dHashes; rejects near-duplicates of any of them."""
+
+    def __init__(self):
+        self.hashes = []
+
+    def accept(self, img):
+        h = img.info.get("dhash")
+        if h is None:
+            return True
+        if any(bin(h ^ o).count("1") <= DUP_MAX_BITS for o in self.hashes):
+            return False
+        self.hashes.append(h)
+        return True
+
+def _finish(img, url):
+    """Tags a fetched image with its source URL and dHash (forces the decode
+    here, on the download worker, rather than later on the render path)."""
+    img.info["source_url"] = url
+    img.info["dhash"] = _dhash(img)
+    return img
+
+def _cached(url, min_w, min_h):
+    """Cached crop (preferred) or original for url, opened and checked."""
+    orig, crop = IMAGE_CACHE.lookup(url)
+    for path in (crop, orig):
+        if not path:
+            continue
+        try:
+            img = _open_checked(path, min_w, min_h)
+        except Exception:
+            img = None
+        if img:
+            return img
+    return None
+
+def _download(url, min_w=400, min_h=300, cancel=None):
+    img = _cached(url, min_w, min_h)
+    if img:
+        return _finish(img, url)
+    try:
+        r = http_client.get(url, retry=False, headers=_BING_HDR, timeout=8, stream=True)
+        with r:
+            if r.status_code != 200:
+                return None
+            ctype = (r.headers.get("Content-Type") or "").lower()
+            if ctype.startswith(_REJECT_TYPES):
+                return None
+            length = int(r.headers.get("Content-Length") or 0)
+            if length > MAX_IMAGE_BYTES:
                 return None
-        img = Image.open(BytesIO(data))
-        if img.width < min_w or img.height < min_h:
+
+            # Preallocate when the size is known; otherwise grow geometrically
+            buf = bytearray(length or 256 * 1024)
+            n, sniffed, steps = 0, None, list(SNIFF_STEPS)
+            while True:
+                # Read exactly up to the next sniff step while the header is
+                # unparsed, so an undersized image is rejected after ~16 KB;
+                # then switch to large reads for the body
+                want  = steps[0] - n if sniffed is None and steps else READ_CHUNK
+                chunk = r.raw.read(want, decode_content=True)
+                if not chunk:
+                    break
+                if cancel is not None and cancel.is_set():
+                    return None
+                end = n + len(chunk)
+                if end > MAX_IMAGE_BYTES:
+                    return None
+                if end > len(buf):
+                    buf.extend(bytes(max(end - len(buf), len(buf))))
+                buf[n:end] = chunk
+                n = end
+                # Parse the header as soon as enough bytes are in and bail early
+                while sniffed is None and steps and n >= steps[0]:
+                    steps.pop(0)
+                    sniffed = _sniff(memoryview(buf)[:n])
+                    if sniffed:
+                        fmt, (w, h) = sniffed
+                        if fmt in _REJECT_FORMATS or w < min_w or h < min_h or w * h > MAX_IMAGE_PIXELS:
+                            return None
+
+        del buf[n:]
+        img = _open_checked(BytesIO(buf), min_w, min_h)
+        if img is None:
             return None
-        return img
+        try: IMAGE_CACHE.put(url, bytes(buf))
+        except Exception as e: print(f"[ASSEMBLER] Image cache failed: {e}")
+        return _finish(img, url)
     except:
         return None
 
+def _iter_fetched(items, fetch, cancel, workers=DOWNLOAD_WORKERS):
+    """Runs fetch(item, cancel) over items on a bounded pool.
+
+    Yields (index, image) as downloads finish. When the consumer stops
+    iterating, cancel is set: queued downloads never start and in-flight
+    ones abort at their next chunk.
+    """
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="img")
+    try:
+        futures = {pool.submit(fetch, item, cancel): i for i, item in enumerate(items)}
+        for fut in as_completed(futures):
+            img = fut.result()
+            if img is not None:
+                yield futures[fut], img
+    finally:
+        cancel.set()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+def _gather(items, fetch, want, distinct):
+    """Up to `want` (image, source) pairs from items, fetched concurrently, in
+    item order. Near-duplicates of already accepted images don't count, so
+    downloading continues until `want` distinct photos are in."""
+    got = {}
+    if want <= 0 or not items:
+        return []
+    results = _iter_fetched(items, fetch, threading.Event())
+    try:
+        for idx, pair in results:
+            if not distinct.accept(pair[0]):
+                print("[ASSEMBLER] ♻️  Duplicate photo skipped")
+                pair[0].close()
+                continue
+            got[idx] = pair
+            print(f"[ASSEMBLER] ✅ {len(got)}/{want}")
+            if len(got) >= want:
+                break
+    finally:
+        results.close()
+    # Earlier search results win ties among the images that finished in time
+    return [got[i] for i in sorted(got)]
+
 # ── card builders ─────────────────────────────────────────────
-def _ticker(draw):
-    draw.rectangle([(0, 1820), (1080, 1920)], fill=RED)
-    draw.text((20, 1833), "🔴 LIVE  •  Follow for more sports updates  •  🔴",
-              font=_font(30), fill=WHITE)
+def _ticker(card):
+    card.paste(_ticker_layer(), TICKER_POS)
 
 def build_opener(title, img):
     card = _enhance(img)
     d = ImageDraw.Draw(card)
-    d.rectangle([(50, 60), (360, 125)], fill=RED)
+    card.paste(_badge(311, 66), (50, 60))
     d.text((65, 70), "⚡ BREAKING NEWS", font=_font(40, True), fill=WHITE)
-    lines = _wrap(d, title.upper(), _font(66, True), 980)
+    head = _font(66, True)
+    lines = _wrap(d, title.upper(), head, 980)
     y = 190
     for ln in lines[:4]:
-        d.text((52, y+2), ln, font=_font(66, True), fill=BLACK)
-        d.text((50, y),   ln, font=_font(66, True), fill=WHITE)
+        d.text((52, y+2), ln, font=head, fill=BLACK)
+        d.text((50, y),   ln, font=head, fill=WHITE)
         y += 80
-    _ticker(d)
+    _ticker(card)
     return card
 
 def build_photo(img, num, total, source=""):
     card = _enhance(img)
     d = ImageDraw.Draw(card)
     # slide counter
-    d.rectangle([(870, 50), (1050, 115)], fill=(0,0,0,200))
+    card.paste(_badge(181, 66, fill=BLACK), (870, 50))
     d.text((885, 58), f"{num}/{total}", font=_font(44, True), fill=WHITE)
     # source badge
     if source:
         s = source.upper()[:16]
         bw = len(s) * 19 + 24
-        d.rectangle([(30, 50), (30+bw, 115)], fill=RED)
+        card.paste(_badge(bw + 1, 66), (30, 50))
         d.text((42, 58), s, font=_font(40, True), fill=WHITE)
-    _ticker(d)
+    _ticker(card)
     return card
 
+# ── parallel render ───────────────────────────────────────────
+def _render_slide(job):
+    """Builds one card and saves it to path, or returns the card itself when
+    path is None (frame mode). Top-level so a process pool can pickle it."""
+    i, total, title, raw, src, path = job
+    try:
+        card = build_opener(title, raw) if i == 0 else build_photo(raw, i+1, total, src)
+        if path is None:
+            return card
+        card.save(path, "JPEG", quality=92, optimize=True)
+        card.close()
+        return path
+    except Exception as e:
+        print(f"[ASSEMBLER] Slide {i+1} error: {e}")
+        return None
+
+def _render_all(jobs):
+    """Renders slides concurrently; results keep slide order.
+
+    "thread" (default) relies on Pillow releasing the GIL in resize, filters
+    and JPEG encode, and shares the font registry. "process" scales further
+    but pickles every source image into the worker, and skips crop caching
+    (see _CACHE_CROPS).
+    """
+    cfg     = AGENT_CONFIG.get("render", {})
+    workers = max(1, min(len(jobs), int(cfg.get("workers") or os.cpu_count() or 1)))
+    if workers == 1:
+        return [_render_slide(j) for j in jobs]
+    if cfg.get("executor") == "process":
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_disable_crop_cache)
+    else:
+        pool = ThreadPoolExecutor(max_workers=workers)
+    with pool:
+        return list(pool.map(_render_slide, jobs))
+
 # ── master assembly ───────────────────────────────────────────
-async def assemble_sports_slides(article_data, all_articles):
+async def assemble_sports_slides(article_data, all_articles, as_frames=False):
+    """Returns slide JPEG paths, or with as_frames=True the rendered 1080x1920
+    RGB cards themselves, for piping straight into FFmpeg.
+
+    Search, download and render all block, so the work runs on a worker
+    thread and the event loop stays free for the LLM and TTS calls.
+    """
+    return await asyncio.to_thread(build_sports_slides, article_data, all_articles, as_frames)
+
+
+def build_sports_slides(article_data, all_articles, as_frames=False):
+    """Blocking body of assemble_sports_slides()."""
     title = article_data.get("title", "Sports News")
     print(f"[ASSEMBLER] Building reel: {title[:60]}")
 
@@ -194,33 +467,42 @@ async def assemble_sports_slides(article_data, all_articles):
     urls  = _bing_search(query, count=TARGET_SLIDES + 10)
 
     # Download from Bing
-    images = []   # (PIL.Image, source_label)
-    for url in urls:
-        if len(images) >= TARGET_SLIDES:
-            break
-        img = _download(url)
-        if img:
-            images.append((img, ""))
-            print(f"[ASSEMBLER] ✅ {len(images)}/{TARGET_SLIDES}")
+    distinct = _DistinctImages()
+
+    def fetch_bing(u, cancel):
+        img = _download(u, cancel=cancel)
+        if img or not cancel.is_set():   # a cancelled download says nothing about the URL
+            bing_cache.record(u, img is not None)
+        return (img, "") if img else None
+
+    images = _gather(urls, fetch_bing, TARGET_SLIDES, distinct)   # [(PIL.Image, source_label)]
 
     # Fallback: OG images from related RSS articles
     if len(images) < TARGET_SLIDES:
         print(f"[ASSEMBLER] Bing gave {len(images)}, trying RSS OG images...")
         kw = [w.lower() for w in re.findall(r'\b[A-Z][a-z]{2,}\b', title)]
-        seen = set()
-        for art in all_articles:
-            if len(images) >= TARGET_SLIDES:
-                break
-            body = (art.get("title","") + " " + art.get("summary","")).lower()
-            if not any(k in body for k in kw):
-                continue
+        # The corpus holds one leader per story; other outlets' reports of
+        # this same story (its cluster members) are the best photo sources
+        story = next((a for a in all_articles if a.get("url") == article_data.get("url")), None)
+        same  = list(story.get("cluster_members", ())) if story else []
+        taken = {id(a) for a in same}
+        pool  = [m for a in all_articles for m in (a, *a.get("cluster_members", ()))]
+        related = same + [art for art in pool if id(art) not in taken
+                          and any(k in (art.get("title","") + " " + art.get("summary","")).lower() for k in kw)]
+        seen, seen_lock = set(), threading.Lock()
+
+        def fetch_og(art, cancel):
+            if cancel.is_set():
+                return None
             u = art.get("image_url") or get_og_image(art["url"])
-            if not u or u in seen:
-                continue
-            seen.add(u)
-            img = _download(u)
-            if img:
-                images.append((img, art.get("source","")))
+            with seen_lock:
+                if not u or u in seen:
+                    return None
+                seen.add(u)
+            img = _download(u, cancel=cancel)
+            return (img, art.get("source","")) if img else None
+
+        images += _gather(related, fetch_og, TARGET_SLIDES - len(images), distinct)
 
     # Clone-fill as last resort
     if 0 < len(images) < TARGET_SLIDES:
@@ -234,28 +516,29 @@ async def assemble_sports_slides(article_data, all_articles):
                 clone = clone.transpose(Image.FLIP_LEFT_RIGHT)
             elif idx % 3 == 1:
                 clone = ImageEnhance.Brightness(clone).enhance(0.88)
+            clone.info.pop("source_url", None)   # don't cache a flipped/dimmed crop
             images.append((clone, sn))
             idx += 1
 
     if not images:
+        bing_cache.save()   # keep the failures: the retry skips those URLs
+        save_og_cache()
         raise ValueError("No images found for this topic")
 
     total = min(len(images), TARGET_SLIDES)
-    paths = []
-    for i in range(total):
-        raw, src = images[i]
-        try:
-            card = build_opener(title, raw) if i == 0 else build_photo(raw, i+1, total, src)
-            p = os.path.join(DATA_DIR, f"slide_{i+1}.jpg")
-            card.save(p, "JPEG", quality=92, optimize=True)
-            card.close()
-            paths.append(p)
-        except Exception as e:
-            print(f"[ASSEMBLER] Slide {i+1} error: {e}")
-        finally:
+    jobs  = [(i, total, title, images[i][0], images[i][1],
+              None if as_frames else os.path.join(DATA_DIR, f"slide_{i+1}.jpg"))
+             for i in range(total)]
+    try:
+        paths = [p for p in _render_all(jobs) if p]
+    finally:
+        for raw, _ in images:
             try: raw.close()
             except: pass
         gc.collect()
 
-    print(f"[ASSEMBLER] ✅ {len(paths)} slides saved")
+    IMAGE_CACHE.flush()
+    bing_cache.save()
+    save_og_cache()
+    print(f"[ASSEMBLER] ✅ {len(paths)} slides {'rendered' if as_frames else 'saved'}")
     return paths
\ No newline at end of file
@@ -0,0 +1,179 @@
+# app/image_cache.py
+# =====================================================
+# ON-DISK IMAGE CACHE
+# + Source URL → content-addressed blob (sha256 of the bytes)
+# + Pre-cropped 1080x1920 derivative stored next to the original
+# + JSON metadata index with a size quota and LRU eviction
+# =====================================================
+
+import os
+import json
+import time
+import hashlib
+import threading
+from typing import Optional
+
+DATA_DIR   = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data"))
+CACHE_DIR  = os.path.join(DATA_DIR, "image_cache")
+INDEX_FILE = os.path.join(CACHE_DIR, "index.json")
+
+QUOTA_BYTES = 300 * 1024 * 1024
+CROP_SIZE   = (1080, 1920)
+
+
+class ImageCache:
+    """Index: {"urls": {url: {"blob": sha256, "atime": ts}},
+               "blobs": {sha256: bytes on disk, original + crop}}.
+
+    Several URLs can point at the same blob (the same press photo behind
+    different CDNs); a blob is deleted only when no URL references it.
+    Sizes are recorded as files are written and a running total is kept,
+    so the quota check never touches the disk; the index itself is written
+    once per reel, by flush().
+    """
+
+    def __init__(self, root: str = CACHE_DIR, quota: int = QUOTA_BYTES):
+        self.root  = root
+        self.quota = quota
+        self.index_file = os.path.join(root, "index.json")
+        self._lock  = threading.Lock()
+        self._index: Optional[dict] = None
+        self._total = 0
+        self._dirty = False
+
+    # ── paths ─────────────────────────────────────────────────
+    def _blob_path(self, blob: str) -> str:
+        return os.path.join(self.root, blob[:2], blob)
+
+    def _crop_path(self, blob: str) -> str:
+        return self._blob_path(blob) + f".{CROP_SIZE[0]}x{CROP_SIZE[1]}.jpg"
+
+    # ── index ─────────────────────────────────────────────────
+    def _load(self) -> dict:
+        if self._index is None:
+            try:
+                with open(self.index_file, "r") as f:
+                    index = json.load(f)
+            except Exception:
+                index = {}
+            if "urls" not in index:   # pre-size format: {url: entry}; measure once
+                urls  = index
+                blobs = {e["blob"]: self._measure(e["blob"]) for e in urls.values()}
+                index = {"urls": urls, "blobs": blobs}
+                self._dirty = True
+            self._index = index
+            self._total = sum(index["blobs"].values())
+        return self._index
+
+    def _measure(self, blob: str) -> int:
+        total = 0
+        for p in (self._blob_path(blob), self._crop_path(blob)):
+            try:
+                total += os.path.getsize(p)
+            except OSError:
+                pass
+        return total
+
+    def _save(self):
+        os.makedirs(self.root, exist_ok=True)
+        tmp = _tmp_name(self.index_file)
+        with open(tmp, "w") as f:
+            json.dump(self._index, f)
+        os.replace(tmp, self.index_file)
+        self._dirty = False
+
+    # ── public API ────────────────────────────────────────────
+    def lookup(self, url: str) -> tuple[Optional[str], Optional[str]]:
+        """(original_path, crop_path) for a cached URL; either may be None."""
+        with self._lock:
+            index = self._load()
+            entry = index["urls"].get(url)
+            if not entry:
+                return None, None
+            blob = self._blob_path(entry["blob"])
+            if not os.path.exists(blob):
+                del index["urls"][url]
+                self._total -= index["blobs"].pop(entry["blob"], 0)
+                return None, None
+            entry["atime"] = time.time()
+            self._dirty = True
+            crop = self._crop_path(entry["blob"])
+            return blob, crop if os.path.exists(crop) else None
+
+    def put(self, url: str, data: bytes) -> str:
+        blob = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(blob)
+        with self._lock:
+            index = self._load()
+            if blob not in index["blobs"] or not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp = _tmp_name(path)
+                with open(tmp, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, path)
+                self._total -= index["blobs"].get(blob, 0)
+                index["blobs"][blob] = len(data)
+                self._total += len(data)
+            index["urls"][url] = {"blob": blob, "atime": time.time()}
+            self._dirty = True
+            self._evict()
+        return blob
+
+    def put_crop(self, url: str, img):
+        """Stores the 1080x1920 derivative for an already cached URL."""
+        with self._lock:
+            entry = self._load()["urls"].get(url)
+            if not entry:
+                return
+            blob = entry["blob"]
+            path = self._crop_path(blob)
+            if os.path.exists(path):
+                return
+        # Encode outside the lock so parallel slide renders don't queue up here
+        tmp = _tmp_name(path)
+        img.save(tmp, "JPEG", quality=92)
+        size = os.path.getsize(tmp)
+        with self._lock:
+            os.replace(tmp, path)
+            blobs = self._load()["blobs"]
+            if blob in blobs:
+                blobs[blob] += size
+                self._total += size
+            self._dirty = True
+            self._evict()
+
+    def flush(self):
+        """Persists the index (new entries, sizes, access times)."""
+        with self._lock:
+            if self._index is not None and self._dirty:
+                self._save()
+
+    # ── eviction ──────────────────────────────────────────────
+    def _evict(self):
+        if self._total <= self.quota:
+            return
+        index = self._load()
+        urls  = index["urls"]
+        # Blob recency = most recent access through any of its URLs
+        last_used: dict[str, float] = {}
+        for entry in urls.values():
+            last_used[entry["blob"]] = max(entry["atime"], last_used.get(entry["blob"], 0.0))
+        for blob in sorted(last_used, key=last_used.get):
+            if self._total <= self.quota:
+                break
+            for p in (self._blob_path(blob), self._crop_path(blob)):
+                try:
+                    os.remove(p)
+                except OSError:
+                    pass
+            self._total -= index["blobs"].pop(blob, 0)
+            for url in [u for u, e in urls.items() if e["blob"] == blob]:
+                del urls[url]
+
+
+def _tmp_name(path: str) -> str:
+    # Unique per process and thread: slides may render in either
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+IMAGE_CACHE = ImageCache()
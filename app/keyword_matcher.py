@@ -0,0 +1,71 @@
+# app/keyword_matcher.py
+# =====================================================
+# COMPILED MULTI-KEYWORD MATCHER
+# + One word-boundary regex over every keyword list
+# + Reports all category hits in a single pass
+# + "mi" / "rr" / "gt" no longer match inside other words
+# + Plurals of longer keywords still count ("indian" → "Indians")
+# =====================================================
+
+import re
+
+_WORD = r"[a-z0-9]"
+PLURAL_MIN_LEN = 4
+
+
+class KeywordMatcher:
+    """Matches lowercased text against named keyword categories.
+
+    All keywords are folded into one alternation (longest first) wrapped in
+    a lookahead, so overlapping phrases are all seen in a single scan. A
+    keyword that contains another keyword as a whole word ("ipl result"
+    contains "ipl") reports the categories of both.
+    """
+
+    def __init__(self, categories: dict[str, list[str]]):
+        self.categories = {name: [kw.lower().strip() for kw in kws if kw.strip()]
+                           for name, kws in categories.items()}
+
+        owners: dict[str, set[str]] = {}
+        for name, kws in self.categories.items():
+            for kw in kws:
+                owners.setdefault(kw, set()).add(name)
+
+        keywords = sorted(owners, key=lambda k: (-len(k), k))
+        # kw -> ((category, keyword), ...) for kw and every keyword inside it
+        self._parts: dict[str, tuple[tuple[str, str], ...]] = {}
+        self._cats:  dict[str, frozenset[str]] = {}
+        for kw in keywords:
+            parts = [(name, other)
+                     for other, names in owners.items()
+                     if other == kw or re.search(_bounded(re.escape(other)), kw)
+                     for name in names]
+            self._parts[kw] = tuple(parts)
+            self._cats[kw]  = frozenset(name for name, _ in parts)
+
+        # Longer keywords also match their plural ("indians", "ipl results");
+        # short codes don't, or "mi" would match the "mis" of "mis-hit".
+        plural = "|".join(re.escape(kw) for kw in keywords if len(kw) >= PLURAL_MIN_LEN) or r"(?!)"
+        exact  = "|".join(re.escape(kw) for kw in keywords if len(kw) < PLURAL_MIN_LEN) or r"(?!)"
+        self._regex = re.compile(r"(?=" + _bounded(f"(?:({plural})s?|({exact}))") + ")")
+
+    def hits(self, text: str) -> dict[str, set[str]]:
+        """{category: {matched keyword, ...}} for every category present in text."""
+        found: dict[str, set[str]] = {}
+        for m in self._regex.finditer(text.lower()):
+            for name, kw in self._parts[m.group(1) or m.group(2)]:
+                found.setdefault(name, set()).add(kw)
+        return found
+
+    def categories_in(self, text: str) -> set[str]:
+        found = set()
+        for m in self._regex.finditer(text.lower()):
+            found |= self._cats[m.group(1) or m.group(2)]
+        return found
+
+    def batch(self, texts: list[str]) -> list[set[str]]:
+        return [self.categories_in(t) for t in texts]
+
+
+def _bounded(pattern: str) -> str:
+    return rf"(?<!{_WORD}){pattern}(?!{_WORD})"
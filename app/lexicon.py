@@ -0,0 +1,63 @@
+# app/lexicon.py
+# =====================================================
+# PRONUNCIATION LEXICON
+# + app/replacements.csv (english → malayalam spelling) for edge-tts
+# + One compiled alternation, longest term first, one linear pass
+# + ASCII word boundaries: "IPL" matches in "IPL-ന്റെ", not in "IPLT"
+# + Reloaded automatically when the CSV's mtime changes
+# =====================================================
+
+import os
+import re
+import csv
+import threading
+from typing import Optional
+
+CSV_FILE = os.path.join(os.path.dirname(__file__), "replacements.csv")
+
+_lock  = threading.Lock()
+_state = {"mtime": None, "pattern": None, "table": {}}
+
+
+def _key(term: str) -> str:
+    return re.sub(r"\s+", " ", term).strip().lower()
+
+
+def _load(mtime: float):
+    table = {}
+    with open(CSV_FILE, "r", encoding="utf-8-sig", newline="") as f:
+        for row in csv.reader(f):
+            # Header, blank and malformed rows have no usable pair
+            if len(row) < 2 or not row[0].strip() or not row[1].strip() or row[0] == "english":
+                continue
+            table[_key(row[0])] = row[1].strip()
+
+    pattern: Optional[re.Pattern] = None
+    if table:
+        terms = sorted(table, key=len, reverse=True)
+        body  = "|".join(r"\s+".join(map(re.escape, t.split(" "))) for t in terms)
+        pattern = re.compile(rf"(?<![A-Za-z0-9])(?:{body})(?![A-Za-z0-9])", re.IGNORECASE)
+    _state.update(mtime=mtime, pattern=pattern, table=table)
+    print(f"[LEXICON] Loaded {len(table)} pronunciations", flush=True)
+
+
+def _current() -> tuple[Optional[re.Pattern], dict]:
+    try:
+        mtime = os.path.getmtime(CSV_FILE)
+    except OSError:
+        return None, {}
+    with _lock:
+        if mtime != _state["mtime"]:
+            try:
+                _load(mtime)
+            except (OSError, csv.Error, UnicodeDecodeError) as e:
+                print(f"[LEXICON] Reload failed, keeping previous table: {e}", flush=True)
+        return _state["pattern"], _state["table"]
+
+
+def apply(text: str) -> str:
+    """Rewrites English terms in text to their Malayalam spellings."""
+    pattern, table = _current()
+    if pattern is None or not text:
+        return text
+    return pattern.sub(lambda m: table[_key(m.group(0))], text)
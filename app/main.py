@@ -33,7 +33,9 @@ from app.sports_fetcher import (
     is_sports_theme,
     mark_as_posted,
     fetch_all_sports_news,
+    get_corpus,
     ALL_FEEDS,
+    FEED_STATUS,
 )
 
 # QStash is optional
@@ -112,6 +114,9 @@ async def run_post_cycle(
     """Fetch news → generate video → post to Instagram."""
 
     # ── 1. Resolve theme (IPL Match Aware) ────────────────────────────────
+    # One corpus snapshot feeds story selection and the engine's OG fallback
+    corpus = get_corpus(max_age_hours=24)
+
     if theme:
         resolved_theme = theme
     else:
@@ -122,6 +127,7 @@ async def run_post_cycle(
         article = get_top_sports_story(
             prefer_match_end=(is_realtime or is_night_slot),
             story_slot=story_slot,
+            corpus=corpus,
         )
         
         if not article:
@@ -130,14 +136,14 @@ async def run_post_cycle(
 
         resolved_theme          = build_sports_theme(article)
         JOB_STATE["last_score"] = article.get("relevance_score", 0)
-        mark_as_posted(article["url"])
+        mark_as_posted(article["url"], article.get("signature"))
 
     JOB_STATE["last_theme"] = resolved_theme
     JOB_STATE["last_type"]  = "realtime_sports" if is_realtime else "sports"
 
     # ── 2. Engine (8-Slot Web Scrape) + Post ─────────────────────────────
     print(f"[AGENT] 🚀 Engine Starting: {resolved_theme[:80]}", flush=True)
-    result = await run_engine(resolved_theme)
+    result = await run_engine(resolved_theme, corpus=corpus)
 
     print("[AGENT] 📲 Posting Reel to Instagram...", flush=True)
     post_id = post_reel_full_pipeline(
@@ -235,6 +241,7 @@ async def health(request: Request):
         "status": "healthy",
         "jobs_active": len(scheduler.get_jobs()),
         "agent_state": JOB_STATE,
+        "feed_status": FEED_STATUS,
         "timestamp": datetime.now(TZ).isoformat(),
     }
 
@@ -0,0 +1,175 @@
+# app/media_probe.py
+# =====================================================
+# IN-PROCESS MEDIA PROBING
+# + MP3: Xing/Info/VBRI frame count, else a walk over frame headers
+# + MP4/MOV: duration from the moov/mvhd box
+# + ffprobe only for anything else (one subprocess, not one per check)
+# =====================================================
+
+import struct
+import subprocess
+from typing import Optional
+
+# kbps by [MPEG-1?][layer 1..3][index]
+_BITRATES = {
+    (True, 1):  (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (True, 2):  (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (True, 3):  (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (False, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (False, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (False, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+# Hz by version bits (3 = MPEG-1, 2 = MPEG-2, 0 = MPEG-2.5)
+_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+
+
+def _frame_header(data: bytes, pos: int) -> Optional[tuple[int, int, int, bool, bool]]:
+    """(frame_bytes, samples, sample_rate, mpeg1, mono) for a header at pos."""
+    if pos + 4 > len(data) or data[pos] != 0xFF or (data[pos + 1] & 0xE0) != 0xE0:
+        return None
+    b1, b2, b3 = data[pos + 1], data[pos + 2], data[pos + 3]
+    version, layer_bits = (b1 >> 3) & 3, (b1 >> 1) & 3
+    br_idx, sr_idx, padding = b2 >> 4, (b2 >> 2) & 3, (b2 >> 1) & 1
+    if version == 1 or layer_bits == 0 or br_idx in (0, 15) or sr_idx == 3:
+        return None
+    layer = 4 - layer_bits
+    mpeg1 = version == 3
+    bitrate = _BITRATES[(mpeg1, layer)][br_idx] * 1000
+    rate    = _SAMPLE_RATES[version][sr_idx]
+    if layer == 1:
+        samples, size = 384, (12 * bitrate // rate + padding) * 4
+    elif layer == 2 or mpeg1:
+        samples, size = 1152, 144 * bitrate // rate + padding
+    else:
+        samples, size = 576, 72 * bitrate // rate + padding
+    return size, samples, rate, mpeg1, (b3 >> 6) == 3
+
+
+def _skip_id3(data: bytes) -> int:
+    if data[:3] != b"ID3" or len(data) < 10:
+        return 0
+    size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+    return size + (20 if data[5] & 0x10 else 10)
+
+
+def _first_frame(data: bytes) -> int:
+    """Offset of the first valid frame header after any ID3v2 tag, or -1."""
+    pos = _skip_id3(data)
+    while 0 <= pos < len(data):
+        if _frame_header(data, pos) is not None:
+            return pos
+        pos = data.find(b"\xff", pos + 1)
+    return -1
+
+
+def _vbr_frames(data: bytes, pos: int) -> Optional[int]:
+    """Frame count from a Xing/Info/VBRI header in the frame at pos."""
+    _, _, _, mpeg1, mono = _frame_header(data, pos)
+    side = (17 if mono else 32) if mpeg1 else (9 if mono else 17)
+    xing = pos + 4 + side
+    if data[xing:xing + 4] in (b"Xing", b"Info") and len(data) >= xing + 12:
+        flags = struct.unpack(">I", data[xing + 4:xing + 8])[0]
+        return struct.unpack(">I", data[xing + 8:xing + 12])[0] if flags & 1 else 0
+    if data[pos + 36:pos + 40] == b"VBRI" and len(data) >= pos + 54:
+        return struct.unpack(">I", data[pos + 50:pos + 54])[0]
+    return None
+
+
+def strip_vbr_header(data: bytes) -> bytes:
+    """Drops a leading Xing/Info/VBRI frame. Needed before joining clips:
+    the first clip's header would otherwise state the whole file's length."""
+    pos = _first_frame(data)
+    if pos < 0 or _vbr_frames(data, pos) is None:
+        return data
+    return data[:pos] + data[pos + _frame_header(data, pos)[0]:]
+
+
+def mp3_duration(data: bytes, trust_vbr_header: bool = True) -> Optional[float]:
+    """Seconds of MPEG audio in data, or None if no frames are found.
+
+    VBR files announce their frame count in the first frame; pass
+    trust_vbr_header=False for joined clips, where only a count is exact.
+    """
+    pos = _first_frame(data)
+    if pos < 0:
+        return None
+    if trust_vbr_header:
+        frames = _vbr_frames(data, pos)
+        if frames:
+            _, samples, rate, _, _ = _frame_header(data, pos)
+            return frames * samples / rate
+
+    total = 0   # samples; the rate is fixed within one stream
+    rate  = 0
+    while pos < len(data):
+        header = _frame_header(data, pos)
+        if header is None:
+            nxt = data.find(b"\xff", pos + 1)   # lost sync (tag, junk) — rescan
+            if nxt < 0:
+                break
+            pos = nxt
+            continue
+        size, samples, rate, _, _ = header
+        if pos + size > len(data):
+            break   # truncated final frame
+        total += samples
+        pos += size
+    return total / rate if total else None
+
+
+def mp4_duration(path: str) -> Optional[float]:
+    """mvhd duration / timescale; seeks past mdat without reading it."""
+    with open(path, "rb") as f:
+        end = f.seek(0, 2)
+        return _find_mvhd(f, 0, end)
+
+
+def _find_mvhd(f, start: int, end: int) -> Optional[float]:
+    pos = start
+    while pos + 8 <= end:
+        f.seek(pos)
+        size, kind = struct.unpack(">I4s", f.read(8))
+        header = 8
+        if size == 1:
+            size = struct.unpack(">Q", f.read(8))[0]
+            header = 16
+        elif size == 0:
+            size = end - pos
+        if size < header:
+            return None
+        if kind == b"moov":
+            return _find_mvhd(f, pos + header, pos + size)
+        if kind == b"mvhd":
+            version = f.read(4)[0]
+            if version == 1:
+                _, _, timescale, duration = struct.unpack(">QQIQ", f.read(28))
+            else:
+                _, _, timescale, duration = struct.unpack(">IIII", f.read(16))
+            return duration / timescale if timescale else None
+        pos += size
+    return None
+
+
+def _ffprobe_duration(path: str) -> float:
+    cmd = ["ffprobe", "-v", "error", "-show_entries", "format=duration",
+           "-of", "default=noprint_wrappers=1:nokey=1", path]
+    try:
+        r = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
+        return float(r.stdout.strip())
+    except Exception:
+        return 0.0
+
+
+def duration(path: str) -> float:
+    """Seconds of media in path; 0.0 when it can't be determined."""
+    try:
+        with open(path, "rb") as f:
+            head = f.read(12)
+        if head[4:8] == b"ftyp":
+            return mp4_duration(path) or _ffprobe_duration(path)
+        if head[:3] == b"ID3" or (len(head) > 1 and head[0] == 0xFF and head[1] & 0xE0 == 0xE0):
+            with open(path, "rb") as f:
+                return mp3_duration(f.read()) or _ffprobe_duration(path)
+    except (OSError, struct.error, IndexError, TypeError, ValueError):
+        pass
+    return _ffprobe_duration(path)
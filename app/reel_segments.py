@@ -0,0 +1,142 @@
+# app/reel_segments.py
+# =====================================================
+# SEGMENT-PARALLEL REEL ENCODER
+# + Each slide → its own short still-image H.264 segment
+# + Segments encode concurrently (one libx264 per core)
+# + Cached under data/segments/ by slide content + duration + encoder args
+# + Final reel = concat demuxer with stream copy, audio muxed in
+# =====================================================
+
+import os
+import hashlib
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+DATA_DIR    = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data"))
+SEGMENT_DIR = os.path.join(DATA_DIR, "segments")
+
+MAX_SEGMENTS = 300    # ~30 reels; oldest (by last use) are deleted first
+TAIL_PAD     = 1.0    # extra seconds on the last slide so video outlasts audio
+
+# Every segment must come out of the same encoder settings, or the
+# stream-copy concat produces a broken file. Changing these changes the
+# cache key, so stale segments are simply never hit again.
+_VIDEO_ARGS = [
+    "-c:v", "libx264",
+    "-preset", "veryfast",
+    "-tune", "stillimage",
+    "-crf", "20",
+    "-pix_fmt", "yuv420p",
+    "-an",
+]
+
+
+def _content_hash(slide) -> str:
+    """Slides are JPEG paths or PIL images (frame mode)."""
+    h = hashlib.sha1()
+    if isinstance(slide, str):
+        with open(slide, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+    else:
+        h.update(f"{slide.size}".encode())
+        h.update(slide.convert("RGB").tobytes())
+    return h.hexdigest()
+
+
+def segment_key(slide, duration: float, fps: int) -> str:
+    params = " ".join(_VIDEO_ARGS) + f" fps={fps} dur={duration:.3f}"
+    return hashlib.sha1(f"{_content_hash(slide)}|{params}".encode()).hexdigest()
+
+
+def _encode(slide, duration: float, fps: int, threads: int, path: str):
+    tmp = f"{path}.{os.getpid()}.tmp.mp4"
+    if isinstance(slide, str):
+        src = ["-loop", "1", "-framerate", str(fps), "-i", slide]
+        vf  = []
+        stdin = None
+    else:
+        w, h = slide.size
+        src = ["-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{w}x{h}",
+               "-framerate", str(fps), "-i", "pipe:0"]
+        vf  = ["-vf", "loop=loop=-1:size=1:start=0"]
+        stdin = slide.convert("RGB").tobytes()
+    cmd = (["ffmpeg", "-y", "-loglevel", "error"] + src + vf
+           + ["-t", f"{duration:.3f}", "-r", str(fps), "-threads", str(threads)]
+           + _VIDEO_ARGS + [tmp])
+    r = subprocess.run(cmd, input=stdin, capture_output=True)
+    if r.returncode != 0:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise RuntimeError(f"Segment encode failed:\n{r.stderr.decode('utf-8', 'replace')[-500:]}")
+    os.replace(tmp, path)
+
+
+def encode_segments(slides: list, per_image: float, fps: int = 24, workers: int = 0) -> list[str]:
+    """Encodes (or reuses) one segment per slide; returns segment paths in order."""
+    os.makedirs(SEGMENT_DIR, exist_ok=True)
+    durations = [per_image] * len(slides)
+    durations[-1] += TAIL_PAD
+
+    keys  = [segment_key(s, d, fps) for s, d in zip(slides, durations)]
+    paths = [os.path.join(SEGMENT_DIR, f"{k}.mp4") for k in keys]
+    todo, seen = [], set()
+    for i, p in enumerate(paths):
+        if os.path.exists(p):
+            os.utime(p)   # mark as recently used for eviction
+        elif p not in seen:   # identical slides share one encode
+            seen.add(p)
+            todo.append(i)
+
+    if todo:
+        cores   = os.cpu_count() or 1
+        workers = max(1, min(len(todo), workers or cores))
+        threads = max(1, cores // workers)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(lambda i: _encode(slides[i], durations[i], fps, threads, paths[i]), todo))
+    print(f"[SEGMENTS] {len(slides)} slides, {len(todo)} encoded, rest cached", flush=True)
+
+    _evict(keep=set(paths))
+    return paths
+
+
+def concat_with_audio(segments: list[str], audio_path: str, output_path: str,
+                      audio_args: list[str]) -> str:
+    """Joins segments without re-encoding video and muxes the audio track.
+    Returns FFmpeg's stderr."""
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", dir=SEGMENT_DIR, delete=False) as f:
+        for p in segments:
+            f.write(f"file '{p}'\n")
+        list_path = f.name
+    cmd = (
+        ["ffmpeg", "-y", "-f", "concat", "-safe", "0", "-i", list_path,
+         "-i", audio_path, "-map", "0:v", "-map", "1:a:0", "-c:v", "copy"]
+        + audio_args + ["-movflags", "+faststart", "-shortest", output_path]
+    )
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True)
+    finally:
+        os.remove(list_path)
+    if result.returncode != 0:
+        raise RuntimeError(f"FFmpeg failed:\n{result.stderr[-1000:]}")
+    return result.stderr
+
+
+def _evict(keep: set[str]):
+    try:
+        names = [n for n in os.listdir(SEGMENT_DIR) if n.endswith(".mp4") and ".tmp" not in n]
+    except OSError:
+        return
+    if len(names) <= MAX_SEGMENTS:
+        return
+    paths = [os.path.join(SEGMENT_DIR, n) for n in names]
+    paths = [p for p in paths if p not in keep]
+    paths.sort(key=lambda p: os.path.getmtime(p))
+    for p in paths[:len(names) - MAX_SEGMENTS]:
+        try:
+            os.remove(p)
+        except OSError:
+            pass
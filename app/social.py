@@ -8,10 +8,10 @@
 
 import os
 import time
-import requests
 import cloudinary
 import cloudinary.uploader
 from dotenv import load_dotenv
+from app import http_client
 
 load_dotenv()
 
@@ -43,14 +43,15 @@ def upload_to_cloudinary(video_path: str) -> str:
 
 def create_ig_container(video_url: str, caption: str) -> str:
     print("[SOCIAL] Creating Instagram container...", flush=True)
-    response = requests.post(
+    response = http_client.post(
         f"{GRAPH_BASE}/{IG_USER_ID}/media",
         data={
             'media_type':   'REELS',
             'video_url':    video_url,
             'caption':      caption,
             'access_token': IG_TOKEN
-        }
+        },
+        timeout=30,
     )
     data = response.json()
     if 'error' in data:
@@ -62,7 +63,7 @@ def wait_for_processing(container_id: str, max_wait: int = 300) -> bool:
     print("[SOCIAL] Waiting for Instagram to process video...", flush=True)
     elapsed = 0
     while elapsed < max_wait:
-        response = requests.get(
+        response = http_client.get(
             f"{GRAPH_BASE}/{container_id}",
             params={'fields': 'status_code', 'access_token': IG_TOKEN}
         )
@@ -78,9 +79,10 @@ def wait_for_processing(container_id: str, max_wait: int = 300) -> bool:
 
 def publish_reel(container_id: str) -> str:
     print("[SOCIAL] Publishing reel live...", flush=True)
-    response = requests.post(
+    response = http_client.post(
         f"{GRAPH_BASE}/{IG_USER_ID}/media_publish",
-        params={'creation_id': container_id, 'access_token': IG_TOKEN}
+        params={'creation_id': container_id, 'access_token': IG_TOKEN},
+        timeout=30,
     )
     data = response.json()
     if 'error' in data:
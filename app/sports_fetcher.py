@@ -9,16 +9,23 @@
 import re
 import os
 import json
+import time
+import threading
 import feedparser
 import requests
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timezone, timedelta
 from email.utils import parsedate_to_datetime
 from typing import Optional
 from app.config import AGENT_CONFIG
+from app import feed_cache, http_client
+from app.keyword_matcher import KeywordMatcher
+from app.cooldown_store import CooldownStore
+from app.story_cluster import MinHashIndex, article_signature, cluster_articles, cluster_key, is_current
+from app.article_store import ArticleStore
 
 SPORTS_CONFIG = AGENT_CONFIG["sports"]
 DATA_DIR      = os.path.join(os.path.dirname(__file__), '..', 'data')
-COOLDOWN_FILE = os.path.join(DATA_DIR, 'sports_cooldown.json')
 
 SCRAPE_HEADERS = {
     "User-Agent": (
@@ -34,29 +41,110 @@ SCRAPE_HEADERS = {
 #  SECTION 1 — OG:IMAGE SCRAPER
 # ═══════════════════════════════════════════════════════════════════════════
 
+OG_CACHE_FILE   = os.path.join(DATA_DIR, 'og_image_cache.json')
+OG_TTL_HIT      = 24 * 3600   # article → image mappings rarely change
+OG_TTL_MISS     = 3 * 3600    # retry pages without a usable image later
+OG_MAX_BYTES    = 256 * 1024  # <head> is almost always well inside this
+
+_META_TAG  = re.compile(rb"<meta\b[^>]*>", re.IGNORECASE)
+_META_ATTR = re.compile(rb"""([\w:-]+)\s*=\s*["']([^"']*)["']""")
+_OG_SKIP   = ["logo", "favicon", "icon", "placeholder", "default", "blank"]
+
+_og_lock  = threading.Lock()
+_og_cache: Optional[dict] = None
+_og_dirty = False
+
+def _og_load() -> dict:
+    global _og_cache
+    if _og_cache is None:
+        try:
+            with open(OG_CACHE_FILE, 'r') as f:
+                _og_cache = json.load(f)
+        except Exception:
+            _og_cache = {}
+    return _og_cache
+
+def _og_cache_get(url: str) -> tuple[bool, Optional[str]]:
+    """(hit, image_url) — a hit with image_url=None is a cached miss."""
+    with _og_lock:
+        entry = _og_load().get(url)
+    if not entry:
+        return False, None
+    ttl = OG_TTL_HIT if entry["img"] else OG_TTL_MISS
+    if time.time() - entry["ts"] > ttl:
+        return False, None
+    return True, entry["img"]
+
+def _og_cache_put(url: str, img_url: Optional[str]):
+    """Records a lookup in memory only; save_og_cache() writes it out."""
+    global _og_dirty
+    with _og_lock:
+        _og_load()[url] = {"img": img_url, "ts": time.time()}
+        _og_dirty = True
+
+def save_og_cache():
+    """Prunes expired entries and writes the cache, once per reel."""
+    global _og_dirty
+    with _og_lock:
+        if not _og_dirty or _og_cache is None:
+            return
+        now = time.time()
+        for k in [k for k, v in _og_cache.items() if now - v["ts"] > OG_TTL_HIT]:
+            del _og_cache[k]
+        try:
+            os.makedirs(DATA_DIR, exist_ok=True)
+            tmp = OG_CACHE_FILE + ".tmp"
+            with open(tmp, 'w') as f:
+                json.dump(_og_cache, f)
+            os.replace(tmp, OG_CACHE_FILE)
+            _og_dirty = False
+        except Exception as e:
+            print(f"[SPORTS] ⚠️  og cache write failed: {e}", flush=True)
+
+def _read_head(resp) -> bytes:
+    """Reads the response until </head> or OG_MAX_BYTES, whichever is first."""
+    buf = bytearray()
+    for chunk in resp.iter_content(8192):
+        start = max(0, len(buf) - 6)  # "</head" may straddle two chunks
+        buf  += chunk
+        # Only the new chunk (plus overlap) is lowercased — keeps this linear
+        if bytes(buf[start:]).lower().find(b"</head>") != -1 or len(buf) >= OG_MAX_BYTES:
+            break
+    return bytes(buf[:OG_MAX_BYTES])
+
+def _meta_image(head: bytes) -> Optional[str]:
+    """og:image, else twitter:image, from one pass over the <meta> tags."""
+    found = {}
+    for tag in _META_TAG.finditer(head):
+        attrs = {k.lower(): v for k, v in _META_ATTR.findall(tag.group(0))}
+        key   = (attrs.get(b"property") or attrs.get(b"name") or b"").lower()
+        if key in (b"og:image", b"twitter:image") and key not in found:
+            found[key] = attrs.get(b"content", b"").decode("utf-8", "ignore").strip()
+    for key in (b"og:image", b"twitter:image"):
+        img_url = found.get(key)
+        if img_url and not any(k in img_url.lower() for k in _OG_SKIP):
+            return img_url
+    return None
+
 def get_og_image(url: str, timeout: int = 8) -> Optional[str]:
     if not url:
         return None
+    hit, img_url = _og_cache_get(url)
+    if hit:
+        return img_url
     try:
-        resp = requests.get(url, headers=SCRAPE_HEADERS, timeout=timeout)
-        if resp.status_code != 200:
-            return None
-        html = resp.text
-        patterns = [
-            r'<meta\s+property=["\']og:image["\']\s+content=["\']([^"\']+)["\']',
-            r'<meta\s+content=["\']([^"\']+)["\']\s+property=["\']og:image["\']',
-            r'<meta\s+name=["\']twitter:image["\']\s+content=["\']([^"\']+)["\']',
-            r'<meta\s+content=["\']([^"\']+)["\']\s+name=["\']twitter:image["\']',
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, html, re.IGNORECASE)
-            if match:
-                img_url = match.group(1).strip()
-                skip = ["logo", "favicon", "icon", "placeholder", "default", "blank"]
-                if img_url and not any(k in img_url.lower() for k in skip):
-                    print(f"[SPORTS] 🖼️  og:image → {img_url[:80]}", flush=True)
-                    return img_url
-        return None
+        with http_client.get(url, headers=SCRAPE_HEADERS, timeout=timeout, stream=True) as resp:
+            if resp.status_code != 200:
+                # Transient errors are not cached; 4xx pages are a stable miss
+                if 400 <= resp.status_code < 500:
+                    _og_cache_put(url, None)
+                return None
+            head = _read_head(resp)
+        img_url = _meta_image(head)
+        _og_cache_put(url, img_url)
+        if img_url:
+            print(f"[SPORTS] 🖼️  og:image → {img_url[:80]}", flush=True)
+        return img_url
     except Exception as e:
         print(f"[SPORTS] ⚠️  og:image error: {e}", flush=True)
         return None
@@ -65,34 +153,26 @@ def get_og_image(url: str, timeout: int = 8) -> Optional[str]:
 #  SECTION 2 — COOLDOWN SYSTEM
 # ═══════════════════════════════════════════════════════════════════════════
 
-def _load_cooldown() -> dict:
-    try:
-        with open(COOLDOWN_FILE, 'r') as f:
-            return json.load(f)
-    except Exception:
-        return {}
-
-def _save_cooldown(data: dict):
-    os.makedirs(DATA_DIR, exist_ok=True)
-    with open(COOLDOWN_FILE, 'w') as f:
-        json.dump(data, f, indent=2)
-
-def _is_on_cooldown(article_url: str) -> bool:
-    cooldown_h = SPORTS_CONFIG.get("cooldown_hours", 3)
-    data       = _load_cooldown()
-    last_post  = data.get(article_url)
-    if not last_post:
-        return False
-    posted_at = datetime.fromisoformat(last_post).replace(tzinfo=timezone.utc)
-    return datetime.now(timezone.utc) - posted_at < timedelta(hours=cooldown_h)
-
-def mark_as_posted(article_url: str):
-    data = _load_cooldown()
-    data[article_url] = datetime.now(timezone.utc).isoformat()
-    cutoff = datetime.now(timezone.utc) - timedelta(hours=48)
-    data   = {k: v for k, v in data.items()
-              if datetime.fromisoformat(v).replace(tzinfo=timezone.utc) > cutoff}
-    _save_cooldown(data)
+COOLDOWN = CooldownStore()
+
+def _posted_clusters() -> MinHashIndex:
+    """LSH index of story clusters still on cooldown."""
+    index = MinHashIndex()
+    for key, sig in COOLDOWN.signatures(SPORTS_CONFIG.get("cooldown_hours", 3)):
+        if is_current(sig):
+            index.add(sig, key)
+    return index
+
+def _is_on_cooldown(article_url: str, signature: Optional[tuple] = None,
+                    clusters: Optional[MinHashIndex] = None) -> bool:
+    if COOLDOWN.is_on_cooldown(article_url, SPORTS_CONFIG.get("cooldown_hours", 3)):
+        return True
+    # Same story from another outlet counts as already posted
+    return bool(signature and clusters and clusters.find(signature))
+
+def mark_as_posted(article_url: str, signature: Optional[tuple] = None):
+    clusters = {cluster_key(tuple(signature)): tuple(signature)} if signature else None
+    COOLDOWN.mark(article_url, signatures=clusters)
     print(f"[SPORTS] 📌 Marked posted: {article_url[:60]}", flush=True)
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -139,6 +219,17 @@ IPL_TEAMS = [
     "delhi capitals", "punjab kings", "sunrisers hyderabad"
 ]
 
+# Built once at import — one scan of title+summary reports every category
+ARTICLES = ArticleStore(retention_hours=SPORTS_CONFIG.get("article_retention_hours", 72))
+
+KEYWORDS = KeywordMatcher({
+    "ipl":       ["ipl", "indian premier league"],
+    "ipl_team":  IPL_TEAMS,
+    "india":     SPORTS_CONFIG.get("india_keywords", []),
+    "match_end": MATCH_END_KEYWORDS,
+    "pre_match": PRE_MATCH_KEYWORDS,
+})
+
 # ═══════════════════════════════════════════════════════════════════════════
 #  SECTION 4 — RELEVANCE SCORER
 # ═══════════════════════════════════════════════════════════════════════════
@@ -148,24 +239,45 @@ def _get_season_priorities() -> dict:
     seasons = AGENT_CONFIG.get("sport_seasons", {})
     return seasons.get(month, {"cricket": 5, "football": 5})
 
-def score_article(article: dict) -> int:
+def _keyword_hits(article: dict) -> set[str]:
+    hits = article.get("keyword_hits")
+    if hits is None:
+        hits = KEYWORDS.categories_in(article.get("title", "") + " " + article.get("summary", ""))
+        article["keyword_hits"] = hits
+    return hits
+
+def _base_score(article: dict) -> int:
+    """Time-independent part of the score; computed once when an article arrives."""
     score = 0
-    title_summary = (article.get("title", "") + " " + article.get("summary", "")).lower()
-    current_hour = datetime.now().hour # Use local hour for schedule awareness
+    hits  = _keyword_hits(article)
 
     # ── IPL & Team Booster (0-55 pts) ──
-    is_ipl = "ipl" in title_summary or "indian premier league" in title_summary
-    if is_ipl:
+    if "ipl" in hits:
         score += 45
     
-    team_hits = sum(1 for team in IPL_TEAMS if team in title_summary)
-    if team_hits > 0:
+    if "ipl_team" in hits:
+        score += 10
+
+    # ── India Relevance (0-25) ──
+    if "india" in hits:
+        score += 25
+    elif article.get("region") == "india":
         score += 10
 
+    # ── Source Quality (0-5) ──
+    priority = article.get("priority", 4)
+    score += max(0, 6 - priority)
+    return score
+
+def _timely_score(article: dict, current_hour: int) -> int:
+    """Time-of-day and freshness points; recomputed on every ranking."""
+    score = 0
+    hits  = _keyword_hits(article)
+
     # ── Time-of-Day Logic (0-15 pts) ──
     # Noon (11am - 3pm): Prioritize Lineups & Pre-match
     if 11 <= current_hour <= 15:
-        if any(kw in title_summary for kw in PRE_MATCH_KEYWORDS):
+        if "pre_match" in hits:
             score += 15
             print(f"[SPORTS] 🎯 Pre-match priority detected for slot.", flush=True)
     # Night (8pm - 12am): Prioritize Results
@@ -173,14 +285,6 @@ def score_article(article: dict) -> int:
         if article.get("is_match_end"):
             score += 15
 
-    # ── India Relevance (0-25) ──
-    india_keywords = SPORTS_CONFIG.get("india_keywords", [])
-    india_hits = sum(1 for kw in india_keywords if kw in title_summary)
-    if india_hits >= 1:
-        score += 25
-    elif article.get("region") == "india":
-        score += 10
-
     # ── Freshness (0-30) ──
     pub_date = article.get("pub_date")
     if pub_date:
@@ -190,15 +294,30 @@ def score_article(article: dict) -> int:
         elif age_hours <= 12: score += 10
     else:
         score += 5
+    return score
 
-    # ── Source Quality (0-5) ──
-    priority = article.get("priority", 4)
-    score += max(0, 6 - priority)
+def score_article(article: dict, current_hour: Optional[int] = None) -> int:
+    if current_hour is None:
+        current_hour = datetime.now().hour # Use local hour for schedule awareness
+    base = article.get("base_score")
+    if base is None:
+        base = article["base_score"] = _base_score(article)
 
-    final = min(100, score)
+    final = min(100, base + _timely_score(article, current_hour))
     article["relevance_score"] = final
     return final
 
+def score_articles(articles: list[dict]) -> list[dict]:
+    """Scores a whole corpus: one matcher pass per unmatched article, one clock read."""
+    current_hour = datetime.now().hour
+    pending = [a for a in articles if a.get("keyword_hits") is None]
+    texts   = [a.get("title", "") + " " + a.get("summary", "") for a in pending]
+    for art, hits in zip(pending, KEYWORDS.batch(texts)):
+        art["keyword_hits"] = hits
+    for art in articles:
+        score_article(art, current_hour)
+    return articles
+
 # ═══════════════════════════════════════════════════════════════════════════
 #  SECTION 5 — CORE RSS FETCH LOGIC
 # ═══════════════════════════════════════════════════════════════════════════
@@ -224,10 +343,6 @@ def _clean_text(text: str) -> str:
         text = text.replace(e, c)
     return text.strip()
 
-def _is_match_end(title: str, summary: str) -> bool:
-    combined = (title + " " + summary).lower()
-    return any(kw in combined for kw in MATCH_END_KEYWORDS)
-
 def _rss_thumbnail(entry) -> Optional[str]:
     if hasattr(entry, "media_thumbnail") and entry.media_thumbnail:
         return entry.media_thumbnail[0].get("url")
@@ -235,43 +350,150 @@ def _rss_thumbnail(entry) -> Optional[str]:
         return entry.media_content[0].get("url")
     return None
 
-def _fetch_feed(feed_cfg: dict, max_age_hours: int = 24) -> list[dict]:
-    articles = []
+def _entry_record(entry) -> Optional[dict]:
+    title = _clean_text(entry.get("title", ""))
+    url   = entry.get("link", "")
+    if not title or not url:
+        return None
+    pub_date = _parse_pub_date(entry)
+    return {
+        "title":     title,
+        "summary":   _clean_text(entry.get("summary", "")),
+        "url":       url,
+        "pub_date":  pub_date.isoformat() if pub_date else None,
+        "image_url": _rss_thumbnail(entry),
+    }
+
+def _feed_entries(feed_cfg: dict, timeout: float) -> tuple[list[dict], bool]:
+    """Returns (entries, cache_hit) using a conditional GET against feed_cache."""
+    url  = feed_cfg["url"]
+    # No retries: the per-feed timeout and batch deadline already bound the wait
+    resp = http_client.get(
+        url,
+        retry=False,
+        headers={**SCRAPE_HEADERS, **feed_cache.conditional_headers(url)},
+        timeout=timeout,
+    )
+    etag, last_modified = resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+    if resp.status_code == 304:
+        cached = feed_cache.get_entries(url)
+        if cached is not None:
+            feed_cache.touch(url, etag, last_modified)
+            return cached, True
+        # Validators without entries (cache file lost) — refetch unconditionally
+        resp = http_client.get(url, retry=False, headers=SCRAPE_HEADERS, timeout=timeout)
+        etag, last_modified = resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+    resp.raise_for_status()
+
+    digest = feed_cache.body_hash(resp.content)
+    cached = feed_cache.get_entries(url, digest)
+    if cached is not None:
+        feed_cache.touch(url, etag, last_modified)
+        return cached, True
+
+    parsed = feedparser.parse(resp.content)
+    if parsed.bozo and not parsed.entries:
+        return [], False
+    entries = [rec for rec in map(_entry_record, parsed.entries) if rec]
+    feed_cache.store(url, entries, digest, etag, last_modified)
+    return entries, False
+
+def _new_article(feed_cfg: dict, rec: dict) -> dict:
+    """Builds and scores an article the first time its URL is seen."""
+    pub_date = datetime.fromisoformat(rec["pub_date"]) if rec["pub_date"] else None
+    hits     = KEYWORDS.categories_in(rec["title"] + " " + rec["summary"])
+    article  = {
+        "title":        rec["title"],
+        "summary":      rec["summary"],
+        "url":          rec["url"],
+        "source":       feed_cfg["name"],
+        "category":     feed_cfg["category"],
+        "region":       feed_cfg["region"],
+        "priority":     feed_cfg["priority"],
+        "pub_date":     pub_date,
+        "is_match_end": "match_end" in hits,
+        "keyword_hits": hits,
+        "image_url":    rec["image_url"],
+    }
+    article["signature"]  = article_signature(article)
+    article["base_score"] = _base_score(article)
+    return article
+
+def _ingest(feed_cfg: dict, entries: list[dict]) -> int:
+    """Adds a feed's unseen entries to the article store; returns how many were new."""
+    new = []
+    for rec in entries:
+        if ARTICLES.known(rec["url"]):
+            continue
+        pub_date = datetime.fromisoformat(rec["pub_date"]) if rec["pub_date"] else None
+        if not _is_fresh(pub_date, ARTICLES.retention_hours):
+            continue
+        new.append(_new_article(feed_cfg, rec))
+    ARTICLES.add(new)
+    return len(new)
+
+# Per-feed outcome of the most recent fetch_all_sports_news() call:
+#   {feed_name: {"status": "ok" | "empty" | "error" | "timeout", "entries": n,
+#                "new": n, "cached": bool, "ms": t}}
+FEED_STATUS: dict = {}
+
+def _fetch_feed_timed(feed_cfg: dict, timeout: float) -> tuple[list[dict], dict]:
+    start, cached = time.monotonic(), False
     try:
-        parsed = feedparser.parse(feed_cfg["url"])
-        if parsed.bozo and not parsed.entries:
-            return []
-        for entry in parsed.entries:
-            pub_date = _parse_pub_date(entry)
-            if not _is_fresh(pub_date, max_age_hours):
-                continue
-            title   = _clean_text(entry.get("title", ""))
-            summary = _clean_text(entry.get("summary", ""))
-            url     = entry.get("link", "")
-            if not title or not url:
-                continue
-            articles.append({
-                "title":        title,
-                "summary":      summary,
-                "url":          url,
-                "source":       feed_cfg["name"],
-                "category":     feed_cfg["category"],
-                "region":       feed_cfg["region"],
-                "priority":     feed_cfg["priority"],
-                "pub_date":     pub_date,
-                "is_match_end": _is_match_end(title, summary),
-                "image_url":    _rss_thumbnail(entry),
-            })
+        entries, cached = _feed_entries(feed_cfg, timeout)
+        status = "ok" if entries else "empty"
+    except requests.Timeout:
+        entries, status = [], "timeout"
     except Exception as e:
         print(f"[SPORTS] ❌ Feed [{feed_cfg['name']}]: {e}", flush=True)
-    return articles
+        entries, status = [], "error"
+    ms = int((time.monotonic() - start) * 1000)
+    return entries, {"status": status, "entries": len(entries), "new": 0, "cached": cached, "ms": ms}
+
+def _fetch_feeds_concurrently() -> dict:
+    """Fetches ALL_FEEDS on a bounded thread pool and ingests new entries.
+
+    Each feed gets its own socket timeout and the whole batch a global
+    deadline; feeds still running at the deadline are reported as
+    "timeout" and their results dropped. Returns the per-feed status.
+    """
+    timeout  = SPORTS_CONFIG.get("feed_timeout_seconds", 8)
+    deadline = SPORTS_CONFIG.get("feed_deadline_seconds", 20)
+    workers  = SPORTS_CONFIG.get("feed_workers", 6)
+
+    status = {}
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="feed")
+    try:
+        futures = {
+            pool.submit(_fetch_feed_timed, feed_cfg, timeout): feed_cfg
+            for feed_cfg in ALL_FEEDS
+        }
+        done, pending = wait(futures, timeout=deadline)
+        # Ingest in ALL_FEEDS order so a URL shared by two feeds keeps the same source
+        for fut, feed_cfg in futures.items():
+            if fut in done:
+                entries, st = fut.result()
+                st["new"] = _ingest(feed_cfg, entries)
+            else:
+                fut.cancel()
+                st = {"status": "timeout", "entries": 0, "new": 0, "cached": False, "ms": int(deadline * 1000)}
+            status[feed_cfg["name"]] = st
+            hit = " cached" if st["cached"] else ""
+            print(f"[SPORTS] 📡 {feed_cfg['name']}: {st['status']}{hit} ({st['new']} new / {st['entries']}, {st['ms']}ms)", flush=True)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    feed_cache.save()
+
+    FEED_STATUS.clear()
+    FEED_STATUS.update(status)
+    return status
 
 def fetch_all_sports_news(max_age_hours: int = 24) -> list[dict]:
-    raw = []
-    for feed_cfg in ALL_FEEDS:
-        print(f"[SPORTS] 📡 {feed_cfg['name']}", flush=True)
-        raw.extend(_fetch_feed(feed_cfg, max_age_hours))
+    _fetch_feeds_concurrently()
+    raw = ARTICLES.window(max_age_hours)
 
+    # Exact-title duplicates first (cheap), then fold near-duplicate stories;
+    # scoring before clustering makes the best-scored report each cluster's leader
     seen, deduped = set(), []
     for art in raw:
         key = re.sub(r'\W+', '', art["title"].lower())[:60]
@@ -279,28 +501,69 @@ def fetch_all_sports_news(max_age_hours: int = 24) -> list[dict]:
             seen.add(key)
             deduped.append(art)
 
-    for art in deduped:
-        score_article(art)
-
+    score_articles(deduped)
     deduped.sort(key=lambda x: x.get("relevance_score", 0), reverse=True)
+    deduped = cluster_articles(deduped)
 
-    print(f"[SPORTS] ✅ {len(deduped)} articles scored. Top: {deduped[0]['relevance_score'] if deduped else 0}", flush=True)
+    print(f"[SPORTS] ✅ {len(deduped)} stories scored. Top: {deduped[0]['relevance_score'] if deduped else 0}", flush=True)
     return deduped
 
 # ═══════════════════════════════════════════════════════════════════════════
-#  SECTION 6 — SMART STORY SELECTION
+#  SECTION 6 — CORPUS SNAPSHOT
+# ═══════════════════════════════════════════════════════════════════════════
+
+class CorpusSnapshot:
+    """One fetched + scored article list, shared by everything in a post cycle.
+
+    Story selection, the OG-image fallback in the assembler and /sports-preview
+    all read the same snapshot instead of re-fetching every feed.
+    """
+
+    def __init__(self, articles: list[dict], max_age_hours: int):
+        self.articles      = articles
+        self.max_age_hours = max_age_hours
+        self.fetched_at    = time.monotonic()
+
+    def age_seconds(self) -> float:
+        return time.monotonic() - self.fetched_at
+
+    def is_fresh(self, ttl_seconds: float) -> bool:
+        return self.age_seconds() < ttl_seconds
+
+_SNAPSHOT: Optional[CorpusSnapshot] = None
+
+def get_corpus(max_age_hours: int = 24, refresh: bool = False) -> CorpusSnapshot:
+    """Returns the shared snapshot, re-fetching once it is older than corpus_ttl_seconds."""
+    global _SNAPSHOT
+    ttl  = SPORTS_CONFIG.get("corpus_ttl_seconds", 300)
+    snap = _SNAPSHOT
+    if (not refresh and snap is not None
+            and snap.max_age_hours == max_age_hours and snap.is_fresh(ttl)):
+        print(f"[SPORTS] ♻️  Reusing corpus snapshot ({len(snap.articles)} articles, {snap.age_seconds():.0f}s old)", flush=True)
+        return snap
+    _SNAPSHOT = CorpusSnapshot(fetch_all_sports_news(max_age_hours), max_age_hours)
+    return _SNAPSHOT
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  SECTION 7 — SMART STORY SELECTION
 # ═══════════════════════════════════════════════════════════════════════════
 
 def get_top_sports_story(
     prefer_match_end: bool = False,
     max_age_hours: int = 24,
     story_slot: int = 1,
+    corpus: Optional[CorpusSnapshot] = None,
 ) -> Optional[dict]:
-    articles = fetch_all_sports_news(max_age_hours)
+    if corpus is None:
+        corpus = get_corpus(max_age_hours)
+    articles = corpus.articles
     if not articles:
         return None
 
-    unposted = [a for a in articles if not _is_on_cooldown(a["url"])]
+    COOLDOWN.refresh()
+    clusters = _posted_clusters()
+    unposted = [a for a in articles
+                if not _is_on_cooldown(a["url"], a.get("signature"), clusters)]
     if not unposted:
         return None
 
@@ -320,7 +583,7 @@ def get_top_sports_story(
     return chosen
 
 # ═══════════════════════════════════════════════════════════════════════════
-#  SECTION 7 — THEME HELPERS
+#  SECTION 8 — THEME HELPERS
 # ═══════════════════════════════════════════════════════════════════════════
 
 def build_sports_theme(article: dict) -> str:
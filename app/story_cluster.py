@@ -0,0 +1,154 @@
+# app/story_cluster.py
+# =====================================================
+# NEAR-DUPLICATE STORY CLUSTERING
+# + MinHash signatures over headline word-pair shingles
+# + Team / country codes expanded first ("MI" → "mumbai indians")
+# + LSH band index → candidate lookup without pairwise scans
+# + Same IPL result from CricBuzz / NDTV / Cricinfo → one cluster
+# =====================================================
+
+import re
+import random
+import hashlib
+from typing import Optional
+
+NUM_PERM   = 128
+BANDS      = 32              # 32 bands × 4 rows → ~99% recall at THRESHOLD
+ROWS       = NUM_PERM // BANDS
+THRESHOLD  = 0.65            # estimated Jaccard to count as the same story
+_PRIME     = (1 << 61) - 1
+
+_rng   = random.Random(0x5EED)           # fixed: signatures persist in the cooldown store
+_PERMS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+_STOP = {
+    "a", "an", "the", "of", "in", "on", "at", "to", "for", "and", "or", "is",
+    "are", "was", "were", "be", "by", "with", "as", "from", "after", "vs", "v",
+    "his", "her", "their", "its", "this", "that", "it", "has", "have", "will",
+    "news", "live", "update", "updates", "today", "2026",
+}
+
+
+# Headlines mix codes and full names for the same side; without this
+# "MI beat CSK" and "Mumbai Indians beat Chennai Super Kings" share nothing
+_ALIASES = {
+    "mi": "mumbai indians", "csk": "chennai super kings", "rcb": "royal challengers bengaluru",
+    "gt": "gujarat titans", "lsg": "lucknow super giants", "kkr": "kolkata knight riders",
+    "rr": "rajasthan royals", "dc": "delhi capitals", "pbks": "punjab kings",
+    "srh": "sunrisers hyderabad",
+    "ind": "india", "aus": "australia", "pak": "pakistan", "eng": "england",
+    "sa": "south africa", "nz": "new zealand", "sl": "sri lanka", "wi": "west indies",
+    "ban": "bangladesh", "afg": "afghanistan",
+}
+_NUMBERS = {
+    "one": "1", "two": "2", "three": "3", "four": "4", "five": "5",
+    "six": "6", "seven": "7", "eight": "8", "nine": "9", "ten": "10",
+}
+
+
+def _words(text: str) -> list[str]:
+    words = []
+    for w in re.findall(r"[a-z0-9]+", text.lower()):
+        w = _NUMBERS.get(w, w)
+        words += _ALIASES.get(w, w).split()
+    return [w for w in words if w not in _STOP]
+
+
+def _shingles(text: str) -> set[str]:
+    # Word pairs keep "beat australia" apart from "beat pakistan", which
+    # single words (everything else shared) could not
+    words = _words(text)
+    if len(words) < 2:
+        return set(words)
+    return {f"{a} {b}" for a, b in zip(words, words[1:])}
+
+
+def minhash(text: str) -> tuple[int, ...]:
+    hashes = [int.from_bytes(hashlib.blake2b(sh.encode(), digest_size=8).digest(), "big")
+              for sh in _shingles(text)]
+    if not hashes:
+        return tuple([_PRIME] * NUM_PERM)
+    return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMS)
+
+
+def similarity(a: tuple[int, ...], b: tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of the underlying shingle sets."""
+    return sum(x == y for x, y in zip(a, b)) / NUM_PERM
+
+
+def article_signature(article: dict) -> tuple[int, ...]:
+    # Headline only: each outlet writes its own summary, and that extra
+    # text drags reports of the same game below THRESHOLD
+    return minhash(article.get("title", ""))
+
+
+def is_current(sig) -> bool:
+    """False for signatures stored before NUM_PERM last changed."""
+    return sig is not None and len(sig) == NUM_PERM
+
+
+def cluster_key(sig: tuple[int, ...]) -> str:
+    digest = hashlib.sha1(",".join(map(str, sig)).encode()).hexdigest()[:16]
+    return f"cluster:{digest}"
+
+
+class MinHashIndex:
+    """LSH index: signatures are bucketed by each band of ROWS values.
+
+    Pairs above THRESHOLD share a band with high probability, so a lookup
+    only scores the handful of bucket-mates instead of every signature.
+    """
+
+    def __init__(self):
+        self._buckets: dict[tuple, list[tuple[tuple[int, ...], str]]] = {}
+
+    @staticmethod
+    def _bands(sig: tuple[int, ...]):
+        for b in range(BANDS):
+            yield (b,) + sig[b * ROWS:(b + 1) * ROWS]
+
+    def add(self, sig: tuple[int, ...], key: str):
+        for band in self._bands(sig):
+            self._buckets.setdefault(band, []).append((sig, key))
+
+    def find(self, sig: tuple[int, ...], threshold: float = THRESHOLD) -> Optional[str]:
+        best, best_sim = None, threshold
+        seen = set()
+        for band in self._bands(sig):
+            for other, key in self._buckets.get(band, ()):
+                if key in seen:
+                    continue
+                seen.add(key)
+                sim = similarity(sig, other)
+                if sim >= best_sim:
+                    best, best_sim = key, sim
+        return best
+
+
+def cluster_articles(articles: list[dict]) -> list[dict]:
+    """Folds near-duplicates into one representative per story.
+
+    Articles should arrive best-first (highest relevance score); the first
+    article of each cluster leads and is tagged with "cluster_id",
+    "signature", "cluster_size" and "cluster_members" — the other outlets'
+    reports, kept for the OG-image fallback.
+    """
+    index  = MinHashIndex()
+    leader: dict[str, dict] = {}
+    for art in articles:
+        sig = art.get("signature")
+        if not is_current(sig):
+            sig = art["signature"] = article_signature(art)
+        key = index.find(sig)
+        if key is None:
+            key = cluster_key(sig)
+            index.add(sig, key)
+            art["cluster_id"]      = key
+            art["cluster_size"]    = 1
+            art["cluster_members"] = []
+            leader[key] = art
+        else:
+            art["cluster_id"] = key
+            leader[key]["cluster_size"] += 1
+            leader[key]["cluster_members"].append(art)
+    return list(leader.values())
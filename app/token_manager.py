@@ -1,7 +1,7 @@
 import os
-import requests
 from dotenv import load_dotenv
 from pathlib import Path
+from app import http_client
 
 load_dotenv()
 
@@ -20,7 +20,7 @@ def refresh_long_lived_token() -> str | None:
         print("[TOKEN] ❌ Missing env vars — check .env")
         return None
 
-    response = requests.get(
+    response = http_client.get(
         "https://graph.facebook.com/v20.0/oauth/access_token",
         params={
             "grant_type":        "fb_exchange_token",
@@ -48,7 +48,7 @@ def check_token_validity() -> int:
     app_id     = os.getenv("INSTAGRAM_APP_ID")
     app_secret = os.getenv("INSTAGRAM_APP_SECRET")
 
-    response = requests.get(
+    response = http_client.get(
         "https://graph.facebook.com/debug_token",
         params={
             "input_token":  token,
@@ -107,5 +107,5 @@ def _update_env(key: str, value: str):
 
 if __name__ == "__main__":
     # Run directly to manually check/refresh token
-    # python app/token_manager.py
+    # python -m app.token_manager
     auto_refresh_if_needed()
\ No newline at end of file
@@ -0,0 +1,113 @@
+# app/tts_cache.py
+# =====================================================
+# SENTENCE-LEVEL TTS
+# + Script split at sentence boundaries (. ! ? । and newlines)
+# + Sentences synthesized concurrently, bounded by a semaphore
+# + Each clip cached in data/tts_cache/ by (voice, rate, text) hash
+# + Clips joined as raw MP3 frames — no re-encode
+# =====================================================
+
+import os
+import re
+import asyncio
+import hashlib
+
+import edge_tts
+
+from app import media_probe
+
+DATA_DIR  = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data"))
+CACHE_DIR = os.path.join(DATA_DIR, "tts_cache")
+
+MAX_PARALLEL = 4      # concurrent edge-tts websockets
+MAX_CLIPS    = 2000   # oldest (by last use) are deleted first
+MIN_CHARS    = 12     # shorter fragments ride along with the previous sentence
+
+_SENTENCE_END = re.compile(r"(?<=[.!?।])\s+|\n+")
+
+
+def split_sentences(script: str) -> list[str]:
+    sentences = []
+    for part in _SENTENCE_END.split(script):
+        part = part.strip()
+        if not part:
+            continue
+        if sentences and len(part) < MIN_CHARS:
+            sentences[-1] += " " + part
+        else:
+            sentences.append(part)
+    return sentences
+
+
+def strip_id3(data: bytes) -> bytes:
+    """Drops ID3v2 (head) and ID3v1 (tail) tags so clips concatenate cleanly."""
+    if data[:3] == b"ID3" and len(data) >= 10:
+        size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+        size += 20 if data[5] & 0x10 else 10   # header (+ footer)
+        data = data[size:]
+    if len(data) >= 128 and data[-128:-125] == b"TAG":
+        data = data[:-128]
+    return data
+
+
+def _clip_path(voice: str, rate: str, text: str) -> str:
+    key = hashlib.sha1(f"{voice}|{rate}|{text}".encode("utf-8")).hexdigest()
+    return os.path.join(CACHE_DIR, key[:2], f"{key}.mp3")
+
+
+async def _clip(text: str, voice: str, rate: str, sem: asyncio.Semaphore) -> tuple[bytes, bool]:
+    """(mp3 bytes, cache_hit) for one sentence."""
+    path = _clip_path(voice, rate, text)
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        os.utime(path)
+        return data, True
+    except OSError:
+        pass
+
+    async with sem:
+        chunks = []
+        async for chunk in edge_tts.Communicate(text, voice, rate=rate).stream():
+            if chunk["type"] == "audio":
+                chunks.append(chunk["data"])
+    data = strip_id3(b"".join(chunks))
+    if not data:
+        raise RuntimeError(f"TTS returned no audio for: {text[:40]}")
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return data, False
+
+
+async def synthesize(script: str, voice: str, rate: str) -> bytes:
+    """Whole-script MP3, built from cached or freshly synthesized sentences."""
+    sentences = split_sentences(script)
+    if not sentences:
+        raise RuntimeError("Empty voice script")
+    sem = asyncio.Semaphore(MAX_PARALLEL)
+    clips = await asyncio.gather(*(_clip(s, voice, rate, sem) for s in sentences))
+    hits = sum(1 for _, hit in clips if hit)
+    print(f"[TTS] {len(sentences)} sentences, {hits} from cache", flush=True)
+    if hits < len(clips):
+        await asyncio.to_thread(_evict)
+    # A Xing/Info frame at the head of a clip would claim the joined file's
+    # length is that one clip's; drop it (also covers clips cached earlier)
+    return b"".join(media_probe.strip_vbr_header(data) for data, _ in clips)
+
+
+def _evict():
+    files = []
+    for root, _, names in os.walk(CACHE_DIR):
+        files += [os.path.join(root, n) for n in names if n.endswith(".mp3")]
+    if len(files) <= MAX_CLIPS:
+        return
+    files.sort(key=lambda p: os.path.getmtime(p))
+    for p in files[:len(files) - MAX_CLIPS]:
+        try:
+            os.remove(p)
+        except OSError:
+            pass
@@ -14,13 +14,9 @@ def run(cmd, **kwargs):
     return subprocess.run(cmd, capture_output=True, text=True, **kwargs)
 
 def probe_duration(path):
-    r = run(["ffprobe", "-v", "error",
-             "-show_entries", "format=duration",
-             "-of", "default=noprint_wrappers=1:nokey=1", path])
-    try:
-        return float(r.stdout.strip())
-    except Exception:
-        return 0.0
+    # In-process header parse; ffprobe only for unknown formats
+    from app.media_probe import duration
+    return duration(path)
 
 # ─────────────────────────────────────────────────────────────
 print("=" * 60)
@@ -2,8 +2,8 @@
 import asyncio
 from app.engine import run_engine
 from app.sports_fetcher import get_top_sports_story, build_sports_theme
+from app.media_probe import duration
 import os
-import subprocess
 
 
 async def local_test():
@@ -23,19 +23,8 @@ async def local_test():
     theme = build_sports_theme(article)
 
     # Check audio duration BEFORE running engine (optional debug)
-    r = subprocess.run(
-        [
-            "ffprobe",
-            "-v", "error",
-            "-show_entries", "format=duration",
-            "-of", "default=noprint_wrappers=1:nokey=1",
-            "data/temp_audio.mp3"
-        ],
-        capture_output=True,
-        text=True
-    )
-
-    print("AUDIO DURATION:", r.stdout.strip() or "FAILED: " + r.stderr[:200])
+    dur = duration("data/temp_audio.mp3")
+    print("AUDIO DURATION:", f"{dur:.2f}" if dur else "FAILED")
 
     result = await run_engine(theme)
 
@@ -0,0 +1,41 @@
+import pytest
+
+pytest.importorskip("PIL")
+pytest.importorskip("numpy")
+pytest.importorskip("requests")
+pytest.importorskip("feedparser")
+
+from PIL import Image, ImageChops, ImageDraw
+
+from app.image_assembler import BLACK, RED, WHITE, _enhance, _font, build_opener, build_photo
+
+SOURCE = Image.new("RGB", (1080, 1920), (90, 120, 150))
+
+
+def _same(a, b, box):
+    diff = ImageChops.difference(a.crop(box), b.crop(box))
+    return max(hi for _, hi in diff.getextrema()) <= 2
+
+
+def test_opener_badge_matches_drawn_baseline():
+    # Baseline: rectangle + text drawn straight onto the card
+    ref = _enhance(SOURCE.copy())
+    d = ImageDraw.Draw(ref)
+    d.rectangle([(50, 60), (360, 125)], fill=RED)
+    d.text((65, 70), "⚡ BREAKING NEWS", font=_font(40, True), fill=WHITE)
+
+    card = build_opener("Headline", SOURCE.copy())
+    assert _same(card, ref, (0, 0, 1080, 185))   # headline starts at y=190
+
+
+def test_photo_badges_match_drawn_baseline():
+    ref = _enhance(SOURCE.copy())
+    d = ImageDraw.Draw(ref)
+    d.rectangle([(870, 50), (1050, 115)], fill=BLACK)
+    d.text((885, 58), "3/10", font=_font(44, True), fill=WHITE)
+    s = "NDTV SPORTS"
+    d.rectangle([(30, 50), (30 + len(s) * 19 + 24, 115)], fill=RED)
+    d.text((42, 58), s, font=_font(40, True), fill=WHITE)
+
+    card = build_photo(SOURCE.copy(), 3, 10, "NDTV Sports")
+    assert _same(card, ref, (0, 0, 1080, 140))
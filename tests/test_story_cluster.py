@@ -0,0 +1,52 @@
+import pytest
+
+from app.story_cluster import THRESHOLD, cluster_articles, minhash, similarity
+
+SAME_STORY = [
+    ("Mumbai Indians beat Chennai Super Kings by five wickets",
+     "MI beat CSK by 5 wickets in Wankhede thriller"),
+    ("Mumbai Indians beat Chennai Super Kings by five wickets",
+     "MI beat CSK by five wickets as Rohit fires"),
+    ("RCB beat KKR by 7 wickets, Kohli stars",
+     "Royal Challengers Bengaluru beat Kolkata Knight Riders by seven wickets as Kohli shines"),
+    ("IPL 2026: MI vs CSK live score",
+     "IPL 2026 live: Mumbai Indians vs Chennai Super Kings score updates"),
+]
+
+DIFFERENT_MATCH = [
+    ("India beat Australia by 6 wickets in Perth",
+     "India beat Pakistan by 6 wickets in Dubai"),
+    ("IPL 2026: MI vs CSK live score",
+     "IPL 2026: MI vs RR live score"),
+    ("MI beat CSK by 5 wickets",
+     "RR beat CSK by 5 wickets"),
+]
+
+
+@pytest.mark.parametrize("a, b", SAME_STORY)
+def test_same_match_reports_are_similar(a, b):
+    assert similarity(minhash(a), minhash(b)) >= THRESHOLD
+
+
+@pytest.mark.parametrize("a, b", DIFFERENT_MATCH)
+def test_different_matches_stay_apart(a, b):
+    assert similarity(minhash(a), minhash(b)) < THRESHOLD
+
+
+@pytest.mark.parametrize("a, b", SAME_STORY)
+def test_cluster_folds_same_story(a, b):
+    leaders = cluster_articles([{"title": a, "url": "u1"}, {"title": b, "url": "u2"}])
+    assert [x["url"] for x in leaders] == ["u1"]
+    assert leaders[0]["cluster_size"] == 2
+
+
+@pytest.mark.parametrize("a, b", DIFFERENT_MATCH)
+def test_cluster_keeps_different_matches(a, b):
+    leaders = cluster_articles([{"title": a, "url": "u1"}, {"title": b, "url": "u2"}])
+    assert [x["url"] for x in leaders] == ["u1", "u2"]
+
+
+def test_cluster_keeps_members_on_leader():
+    a, b = SAME_STORY[0]
+    leaders = cluster_articles([{"title": a, "url": "u1"}, {"title": b, "url": "u2"}])
+    assert [m["url"] for m in leaders[0]["cluster_members"]] == ["u2"]